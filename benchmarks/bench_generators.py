@@ -0,0 +1,202 @@
+# Benchmark harness for the study_assistant generators.
+#
+# Measures wall time, peak traced memory and throughput per generator and per document size on
+# synthetic and bundled sample corpora, and can save / compare against a baseline to flag regressions.
+#
+#   python benchmarks/bench_generators.py                         # 1KB .. 1MB
+#   python benchmarks/bench_generators.py --full --save base.json # 1KB .. 50MB
+#   python benchmarks/bench_generators.py --compare base.json     # exit code 1 on regressions
+
+import argparse, json, os, platform, random, sys, time, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from study_assistant import (
+    clean_text, analyze_text, extract_context_patterns,
+    generate_summary, generate_gpt_style_questions, generate_mcqs, generate_exam_style_mcqs,
+)
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+DEFAULT_SIZES = "1KB,10KB,100KB,1MB"
+FULL_SIZES = "1KB,10KB,100KB,1MB,10MB,50MB"
+
+# every generator starts from raw (cleaned) text, so each timing includes the analysis it triggers
+GENERATORS = {
+    "clean_text": clean_text,
+    "analyze_text": analyze_text,
+    "extract_context_patterns": extract_context_patterns,
+    "generate_summary": generate_summary,
+    "generate_gpt_style_questions": lambda t: generate_gpt_style_questions(t, count=6),
+    "generate_mcqs": lambda t: generate_mcqs(t, min_q=5),
+    "generate_exam_style_mcqs": lambda t: generate_exam_style_mcqs(t, min_q=5),
+}
+
+# ---------- Corpora ----------
+TERMS = (
+    "enzyme catalysis substrate mitochondria glycolysis photosynthesis chlorophyll membrane osmosis diffusion "
+    "ribosome chromosome replication transcription mutation ecosystem biodiversity hormone receptor neuron "
+    "synapse antibody pathogen vaccine algorithm recursion pointer database compiler scheduler entropy electron"
+).split()
+FILLER = "the of and a to in that for it as with on be by this from at which".split()
+
+def synthetic_sentence(rng, i):
+    a, b, c = rng.sample(TERMS, 3)
+    kind = i % 7
+    if kind == 0:
+        return f"{a.capitalize()} is the process that links {b} to {c}."
+    if kind == 1:
+        return f"High {a} causes increased {b} in the {c} layer."
+    if kind == 2:
+        return f"The {a} is stable, but {b} changes quickly under stress."
+    if kind == 3:
+        return f"Many systems such as {a}, {b} and {c} share this property."
+    if kind == 4:
+        return f"Key parts of {a}: {b}, {c}, {rng.choice(TERMS)}."
+    if kind == 5:
+        return f"{a.capitalize()} regulates {b} because {c} is limited."
+    return " ".join(rng.choice(FILLER + TERMS) for _ in range(16)).capitalize() + "."
+
+def make_synthetic(size, seed=0):
+    # pattern-rich study-notes prose
+    rng = random.Random(seed)
+    parts, n, i = [], 0, 0
+    while n < size:
+        s = synthetic_sentence(rng, i)
+        parts.append(s)
+        n += len(s) + 1
+        i += 1
+    return " ".join(parts)[:size]
+
+def make_unpunctuated(size, seed=0):
+    # PDF-extraction worst case: no sentence punctuation, so the whole input is one "sentence"
+    rng = random.Random(seed)
+    words, n = [], 0
+    while n < size:
+        w = rng.choice(FILLER + TERMS + ["so", "but", "because", "such", "as", "is"])
+        words.append(w)
+        n += len(w) + 1
+    return " ".join(words)[:size]
+
+def make_samples(size, seed=0):
+    # bundled sample notes, tiled up to the requested size
+    texts = []
+    for name in sorted(os.listdir(CORPUS_DIR)):
+        if name.endswith(".txt"):
+            with open(os.path.join(CORPUS_DIR, name), encoding="utf-8") as f:
+                texts.append(f.read())
+    base = "\n\n".join(texts)
+    return (base * (size // len(base) + 1))[:size]
+
+CORPORA = {"synthetic": make_synthetic, "unpunctuated": make_unpunctuated, "samples": make_samples}
+
+# ---------- Measurement ----------
+def parse_size(s):
+    s = s.strip().upper()
+    for unit, mult in (("MB", 1024 * 1024), ("KB", 1024), ("B", 1)):
+        if s.endswith(unit):
+            return int(float(s[:-len(unit)]) * mult)
+    return int(s)
+
+def fmt_size(n):
+    for unit, mult in (("MB", 1024 * 1024), ("KB", 1024)):
+        if n >= mult:
+            return f"{n / mult:g}{unit}"
+    return f"{n}B"
+
+def measure(fn, text, repeat):
+    # best-of-N wall time without tracing, then one traced run for peak memory
+    best = float("inf")
+    for _ in range(repeat):
+        random.seed(0)
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    random.seed(0)
+    tracemalloc.start()
+    fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def run(corpora, sizes, generators, repeat, max_seconds):
+    results = []
+    for corpus in corpora:
+        slow = set()  # generators that already exceeded max_seconds are skipped for larger sizes
+        for size in sizes:
+            text = clean_text(CORPORA[corpus](size))
+            for name in generators:
+                if name in slow:
+                    print(f"{corpus:<12} {fmt_size(size):>6}  {name:<30} skipped (> {max_seconds}s at a smaller size)")
+                    continue
+                seconds, peak = measure(GENERATORS[name], text, repeat if size <= 1024 * 1024 else 1)
+                row = {
+                    "corpus": corpus, "size": size, "generator": name, "seconds": seconds,
+                    "peak_bytes": peak, "mb_per_s": (size / (1024 * 1024)) / seconds if seconds else 0.0,
+                }
+                results.append(row)
+                print(f"{corpus:<12} {fmt_size(size):>6}  {name:<30} {seconds * 1000:10.1f} ms "
+                      f"{peak / (1024 * 1024):9.1f} MB peak {row['mb_per_s']:9.2f} MB/s")
+                if seconds > max_seconds:
+                    slow.add(name)
+    return results
+
+def compare(results, baseline, threshold, min_seconds=0.005):
+    # regression = slower (or hungrier) than baseline by more than threshold, above the timing noise floor
+    base = {(r["corpus"], r["size"], r["generator"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        b = base.get((r["corpus"], r["size"], r["generator"]))
+        if not b:
+            continue
+        t_ratio = r["seconds"] / b["seconds"] if b["seconds"] else 1.0
+        m_ratio = r["peak_bytes"] / b["peak_bytes"] if b["peak_bytes"] else 1.0
+        label = f"{r['corpus']} {fmt_size(r['size'])} {r['generator']}"
+        if t_ratio > threshold and r["seconds"] - b["seconds"] > min_seconds:
+            regressions.append(f"{label}: time {b['seconds'] * 1000:.1f} -> {r['seconds'] * 1000:.1f} ms (x{t_ratio:.2f})")
+        if m_ratio > threshold and r["peak_bytes"] - b["peak_bytes"] > 1024 * 1024:
+            regressions.append(f"{label}: peak memory {b['peak_bytes'] / 2**20:.1f} -> {r['peak_bytes'] / 2**20:.1f} MB (x{m_ratio:.2f})")
+    return regressions
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark study_assistant generators across document sizes.")
+    ap.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated sizes (default: {DEFAULT_SIZES})")
+    ap.add_argument("--full", action="store_true", help=f"use the full ladder {FULL_SIZES}")
+    ap.add_argument("--corpora", default=",".join(CORPORA), help="comma-separated corpora: " + ", ".join(CORPORA))
+    ap.add_argument("--generators", default=",".join(GENERATORS), help="comma-separated generator names")
+    ap.add_argument("--repeat", type=int, default=3, help="timing repeats for inputs up to 1MB (best is kept)")
+    ap.add_argument("--max-seconds", type=float, default=60.0, help="skip larger sizes once a generator exceeds this")
+    ap.add_argument("--save", help="write results to this JSON file")
+    ap.add_argument("--compare", help="baseline JSON produced by --save")
+    ap.add_argument("--threshold", type=float, default=1.25, help="regression ratio vs baseline (default 1.25)")
+    args = ap.parse_args(argv)
+
+    sizes = [parse_size(s) for s in (FULL_SIZES if args.full else args.sizes).split(",")]
+    corpora = [c.strip() for c in args.corpora.split(",") if c.strip()]
+    generators = [g.strip() for g in args.generators.split(",") if g.strip()]
+    unknown = [c for c in corpora if c not in CORPORA] + [g for g in generators if g not in GENERATORS]
+    if unknown:
+        ap.error("unknown corpus/generator: " + ", ".join(unknown))
+
+    results = run(corpora, sizes, generators, args.repeat, args.max_seconds)
+    report = {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), "created": time.strftime("%Y-%m-%d %H:%M:%S")},
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved {len(results)} results to {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("\nNo regressions against", args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
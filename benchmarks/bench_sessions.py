@@ -0,0 +1,221 @@
+# Load test for the Streamlit app: many simulated student sessions against one StudyAssistant.py process.
+#
+# Each session is a headless AppTest client with its own session state; all of them share the process-wide
+# caches, job queue and stores exactly like browser sessions on one server. A session replays
+#   open the page -> load notes -> open the quiz -> answer every question (one rerun per click) -> Submit
+#   -> open the flashcards
+# with --think seconds between clicks, and --concurrency sessions are in flight at once. AppTest is not
+# thread-safe, so reruns are executed one at a time in arrival order: "service" is a rerun's own time and
+# "response" adds the time it waited behind other sessions' reruns, i.e. what a student would see from a
+# process whose script runs are serialized by the GIL. Background generation jobs run on their own threads
+# as in the app. Reported: throughput, p50/p95/p99 per step, and memory per session.
+#
+#   python benchmarks/bench_sessions.py                                  # 20 sessions, 4 in flight
+#   python benchmarks/bench_sessions.py --sessions 200 --concurrency 32 --think 2 --save base.json
+#   python benchmarks/bench_sessions.py --compare base.json              # exit code 1 on regressions
+
+import argparse, gc, heapq, json, logging, os, platform, random, resource, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_generators import make_samples, make_synthetic, parse_size, fmt_size
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "StudyAssistant.py")
+QUIZ_VIEW = "📝 Quiz (MCQs)"
+CARDS_VIEW = "🎴 Flashcards"
+STEPS = ("open", "load", "open_quiz", "answer", "submit", "open_cards")
+
+# ---------- Sessions ----------
+def make_notes(distinct, size, seed=0):
+    # the bundled samples for the first document, then synthetic notes (a class shares few documents)
+    texts = [make_samples(size)]
+    texts += [make_synthetic(size, seed=seed + i) for i in range(1, distinct)]
+    return texts
+
+def session_flow(at, notes, rng):
+    """One student's clicks. Yields (step, open view) before each rerun; the driver runs it."""
+    yield "open", None
+    at.sidebar.text_area[0].input(notes)
+    yield "load", None
+    yield "open_quiz", QUIZ_VIEW
+    for idx in range(len(at.session_state["mcqs_cache"])):
+        box = at.selectbox(key=f"mcq_{idx}")
+        box.select(rng.choice(box.options[1:]))
+        yield "answer", QUIZ_VIEW
+    next(b for b in at.button if b.label == "Submit").click()
+    yield "submit", QUIZ_VIEW
+    yield "open_cards", CARDS_VIEW
+
+def session_bytes(at):
+    # what this session keeps in st.session_state (shared caches are not counted)
+    from study_assistant.compact import deep_sizeof
+    seen = set()
+    return sum(deep_sizeof(v, seen) for v in at.session_state.values())
+
+# ---------- Measurement ----------
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = (len(values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+def rss_bytes():
+    # peak resident set size of this process (Linux reports KiB, macOS bytes)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def run(sessions, concurrency, notes, seed, timeout, think):
+    from streamlit.testing.v1 import AppTest
+    timings = []        # (step, service seconds, response seconds)
+    state_bytes = []
+    errors = []
+    ready = []          # (time the next rerun is requested, session index, flow, AppTest)
+    started = 0
+
+    def start(now):
+        nonlocal started
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        flow = session_flow(at, notes[started % len(notes)], random.Random(f"{seed}:{started}"))
+        heapq.heappush(ready, (now, started, flow, at))
+        started += 1
+
+    rss_before = rss_bytes()
+    t0 = time.perf_counter()
+    while started < min(concurrency, sessions):
+        start(t0)
+    while ready:
+        requested, i, flow, at = heapq.heappop(ready)
+        try:
+            step, view = next(flow)
+        except StopIteration:
+            state_bytes.append(session_bytes(at))
+            step = None
+        except Exception as e:
+            errors.append(f"session {i}: {type(e).__name__}: {e}")
+            step = None
+        if step is None:
+            if started < sessions:
+                start(time.perf_counter())
+            if len(state_bytes) % max(1, sessions // 10) == 0 and state_bytes:
+                print(f"  {len(state_bytes)}/{sessions} sessions", flush=True)
+            continue
+        wait = requested - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        if view is not None:
+            # AppTest does not keep the open tab across reruns; the browser does, so set it every time
+            at.session_state["view"] = view
+        begin = time.perf_counter()
+        at.run()
+        end = time.perf_counter()
+        timings.append((step, end - begin, end - max(requested, t0)))
+        if at.exception:
+            errors.append(f"session {i} {step}: {at.exception[0].message}")
+            if started < sessions:
+                start(end)
+            continue
+        heapq.heappush(ready, (end + think, i, flow, at))
+    wall = time.perf_counter() - t0
+    gc.collect()
+    steps = {}
+    for step in STEPS + ("all",):
+        rows = [t for t in timings if step in (t[0], "all")]
+        if rows:
+            steps[step] = {"reruns": len(rows)}
+            for kind, col in (("service", 1), ("response", 2)):
+                values = [t[col] for t in rows]
+                steps[step][kind] = {f"p{p}": percentile(values, p) for p in (50, 95, 99)}
+                steps[step][kind]["max"] = max(values)
+    return {
+        "sessions": sessions, "completed": len(state_bytes), "concurrency": concurrency, "think": think,
+        "errors": errors, "wall_seconds": wall,
+        "reruns_per_s": len(timings) / wall if wall else 0.0,
+        "sessions_per_s": len(state_bytes) / wall if wall else 0.0, "steps": steps,
+        "session_state_bytes": {
+            "mean": sum(state_bytes) / len(state_bytes) if state_bytes else 0, "max": max(state_bytes, default=0),
+        },
+        "rss_growth_per_session": max(0, rss_bytes() - rss_before) / max(1, started),
+    }
+
+def print_report(r):
+    print(f"\n{r['completed']}/{r['sessions']} sessions, {r['concurrency']} in flight, {r['think']}s think time, "
+          f"{r['wall_seconds']:.1f}s wall")
+    print(f"throughput: {r['reruns_per_s']:.1f} reruns/s, {r['sessions_per_s']:.2f} sessions/s")
+    print(f"{'step':<12} {'reruns':>7}  {'service p50/p95/p99 ms':>26}  {'response p50/p95/p99 ms':>26}")
+    for step, s in r["steps"].items():
+        cols = ["/".join(f"{s[kind][p] * 1000:.0f}" for p in ("p50", "p95", "p99")) for kind in ("service", "response")]
+        print(f"{step:<12} {s['reruns']:>7}  {cols[0]:>26}  {cols[1]:>26}")
+    mem = r["session_state_bytes"]
+    print(f"session state: {fmt_size(int(mem['mean']))} mean, {fmt_size(mem['max'])} max per session; "
+          f"process peak RSS growth {fmt_size(int(r['rss_growth_per_session']))} per session")
+    for e in r["errors"][:10]:
+        print("  error: " + e)
+
+def compare(result, baseline, threshold, min_seconds=0.005):
+    # regression = a step's service p50 or p95 slower than baseline by more than threshold, above the noise floor
+    regressions = []
+    for step, s in result["steps"].items():
+        b = baseline["result"]["steps"].get(step)
+        if not b:
+            continue
+        for p in ("p50", "p95"):
+            new, old = s["service"][p], b["service"][p]
+            ratio = new / old if old else 1.0
+            if ratio > threshold and new - old > min_seconds:
+                regressions.append(f"{step} {p}: {old * 1000:.1f} -> {new * 1000:.1f} ms (x{ratio:.2f})")
+    b_mem = baseline["result"]["session_state_bytes"]["mean"]
+    mem = result["session_state_bytes"]["mean"]
+    if b_mem and mem / b_mem > threshold:
+        regressions.append(f"session state: {fmt_size(int(b_mem))} -> {fmt_size(int(mem))} per session (x{mem / b_mem:.2f})")
+    return regressions
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Load-test StudyAssistant.py with many simulated sessions.")
+    ap.add_argument("--sessions", type=int, default=20, help="simulated student sessions (default 20)")
+    ap.add_argument("--concurrency", type=int, default=4, help="sessions in flight at the same time (default 4)")
+    ap.add_argument("--think", type=float, default=0.0, help="seconds a student waits between clicks (default 0)")
+    ap.add_argument("--distinct", type=int, default=2, help="distinct documents shared among the sessions (default 2)")
+    ap.add_argument("--size", default="10KB", help="size of each document (default 10KB)")
+    ap.add_argument("--seed", default="0", help="seeds the documents and every session's answers")
+    ap.add_argument("--timeout", type=float, default=120.0, help="seconds allowed per rerun")
+    ap.add_argument("--save", help="write results to this JSON file")
+    ap.add_argument("--compare", help="baseline JSON produced by --save")
+    ap.add_argument("--threshold", type=float, default=1.25, help="regression ratio vs baseline (default 1.25)")
+    args = ap.parse_args(argv)
+
+    # AppTest runs log "missing ScriptRunContext" and label warnings on every rerun
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    # a throwaway data directory: runs start cold and never touch the real artifact store or decks
+    os.environ["STUDY_ASSISTANT_HOME"] = tempfile.mkdtemp(prefix="study-load-")
+    notes = make_notes(max(1, args.distinct), parse_size(args.size), seed=random.Random(args.seed).randrange(1 << 30))
+    print(f"{args.sessions} sessions x {len(STEPS)} steps on {len(notes)} documents of {fmt_size(parse_size(args.size))}")
+    result = run(args.sessions, max(1, args.concurrency), notes, args.seed, args.timeout, args.think)
+    print_report(result)
+    report = {
+        "meta": {
+            "python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"), "args": vars(args),
+        },
+        "result": result,
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("\nNo regressions against", args.compare)
+    return 0 if not result["errors"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
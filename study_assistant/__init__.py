@@ -0,0 +1,25 @@
+# AI STUDY ASSISTANT — headless NLP core
+# Importable without Streamlit: the app (StudyAssistant.py) and the batch CLI (python -m study_assistant) share it.
+
+from .text import clean_text, split_sentences, content_hash
+from .keywords import looks_technical
+from .tfidf import tfidf_scores, rank_by_tfidf, load_background
+from .distractors import build_distractor_index, near_misses
+from .summarize import rank_sentences, select_summary
+from .domain import detect_domain, domain_scores, register_domain
+from .templates import create_question_templates
+from .patterns import extract_context_patterns, classify_sentence
+from .analysis import (
+    analyze_text, ensure_analysis, extract_candidate_keywords, extract_main_ideas, extract_good_keywords,
+)
+from .generators import (
+    generate_summary, generate_gpt_style_questions, generate_mcqs, generate_exam_style_mcqs, default_flashcards,
+)
+from .variants import generate_quiz_variants, write_jsonl
+from .cache import LRUCache, RESULT_CACHE_SIZE
+from .incremental import is_edit, carry_over_answers
+from .jobs import JobQueue, JobCancelled
+from .library import Library
+from .review import Deck, ReviewStore, sm2
+from .events import EventLog
+from .ingest import read_uploaded, read_path, iter_pdf_pages
@@ -0,0 +1,166 @@
+# Shared analysis: split, tokenize and extract patterns once per document (chunked map-reduce)
+
+from collections import Counter
+
+from .text import split_sentences, content_hash, WORD_RE
+from .keywords import COMMON_WORDS, EXTRA_COMMON_WORDS, looks_technical
+from .tfidf import rank_by_tfidf
+from .summarize import rank_sentences
+from .distractors import build_distractor_index
+from .patterns import extract_context_patterns
+from .domain import detect_domain
+from .metrics import maybe_stage
+from .chunking import split_chunks, content_chunks, map_chunks
+
+MAIN_IDEAS_KEEP = 64   # ranked main-idea sentences kept per document (generators use the first few)
+KEYWORDS_KEEP = 200    # ranked keywords / candidates kept per document
+KEYWORD_STOPLIST = COMMON_WORDS | EXTRA_COMMON_WORDS
+
+def analyze_chunk(text, metrics=None):
+    """Map step: tokenize, count and extract patterns for one chunk (chunk-local sentence indices)."""
+    with maybe_stage(metrics, "split_sentences"):
+        sentences, kinds = split_sentences(text, kinds=True)
+    with maybe_stage(metrics, "tokenize"):
+        words = WORD_RE.findall(text)
+        forms = Counter(words)  # case-sensitive; lowercase frequencies are derived after the merge
+    with maybe_stage(metrics, "patterns"):
+        patterns = extract_context_patterns(text, sentences)
+    return {
+        "sentences": sentences, "kinds": kinds, "tokens": len(words), "forms": forms, "patterns": patterns,
+    }
+
+def merge_chunks(parts):
+    """Reduce step: combine analyze_chunk() results in document order. Equivalent to analyzing the
+    whole text at once: counts are summed and first-seen orders are kept, so ties rank the same."""
+    sentences = []; kinds = []; forms = Counter(); tokens = 0
+    patterns = {k: [] for k in ("definitions", "causes", "contrasts", "examples", "enumerations")}
+    steps = []
+    for part in parts:
+        sentences.extend(part["sentences"])
+        kinds.extend(part["kinds"])
+        tokens += part["tokens"]
+        forms.update(part["forms"])
+        for k in patterns:
+            patterns[k].extend(part["patterns"][k])
+        for _, chunk_steps in part["patterns"]["processes"]:
+            steps.extend(chunk_steps)
+    patterns["processes"] = [("Steps", steps[:6])] if steps else []
+    # lowercase frequencies, and the most common spelling of each word for display ("DNA", "photosynthesis")
+    freq = Counter(); display = {}
+    for form, c in forms.items():
+        key = form.lower()
+        freq[key] += c
+        if c > forms.get(display.get(key), 0):
+            display[key] = form
+    return {
+        "sentences": sentences,
+        "kinds": kinds,
+        "tokens": tokens,
+        "freq": freq,
+        "display": display,
+        "patterns": patterns,
+    }
+
+def map_cached_chunks(chunks, chunk_cache, total_chars):
+    # analyze only the chunks not seen before (keyed by chunk content); returns (parts, reused count)
+    missing = object()
+    keys = [("chunk", content_hash(c)) for c in chunks]
+    parts = [chunk_cache.get(k, missing) for k in keys]
+    todo = [i for i, p in enumerate(parts) if p is missing]
+    fresh = map_chunks(analyze_chunk, [chunks[i] for i in todo], total_chars=sum(len(chunks[i]) for i in todo))
+    for i, part in zip(todo, fresh):
+        chunk_cache.put(keys[i], part)
+        parts[i] = part
+    return parts, len(chunks) - len(todo)
+
+def analyze_text(text, metrics=None, chunk_cache=None):
+    """Split, tokenize and extract patterns once; every generator reads from the result.
+    Large inputs are cut into chunks that are analyzed independently (in parallel past
+    PARALLEL_MIN_CHARS) and merged, which bounds the per-step working set.
+    Keywords are ranked by TF-IDF against the shipped background document frequencies.
+    Sentences are ranked by TextRank over their TF-IDF vectors (see summarize.py).
+    Returns dict: text, hash, sentences, sentence_kinds, freq, keywords, candidates, neighbors, sentence_rank, main_ideas,
+    patterns, domain, stats.
+    metrics: optional Metrics that receives per-stage timings.
+    chunk_cache: optional LRUCache of per-chunk results. Chunks are then content-defined, so after an
+    edit only the changed chunks are re-analyzed and the rest are merged from the cache.
+    """
+    text = text or ""
+    chunks = split_chunks(text) if chunk_cache is None else content_chunks(text)
+    reused = 0
+    if chunk_cache is not None:
+        with maybe_stage(metrics, "chunk_map"):
+            parts, reused = map_cached_chunks(chunks, chunk_cache, len(text))
+    elif len(chunks) == 1:
+        parts = [analyze_chunk(chunks[0], metrics=metrics)]
+    else:
+        with maybe_stage(metrics, "chunk_map"):
+            parts = map_chunks(analyze_chunk, chunks, total_chars=len(text))
+    with maybe_stage(metrics, "chunk_merge"):
+        merged = merge_chunks(parts)
+    with maybe_stage(metrics, "keywords"):
+        display = merged["display"]
+        ranked = rank_by_tfidf(merged["freq"], exclude=KEYWORD_STOPLIST)
+        keywords = [display[w] for w in ranked[:KEYWORDS_KEEP]]
+        candidates = [display[w] for w in ranked if len(w) >= 5][:KEYWORDS_KEEP]
+    with maybe_stage(metrics, "rank_sentences"):
+        # TextRank centrality (approximate centroid ranking for very long documents); headings and list
+        # items rank after running text
+        order = rank_sentences(merged["sentences"], exclude=KEYWORD_STOPLIST, kinds=merged["kinds"])
+    with maybe_stage(metrics, "distractors"):
+        # near-miss terms for MCQ options: ranked keywords plus defined terms
+        neighbors = build_distractor_index(keywords + [t for t, _ in merged["patterns"]["definitions"]])
+    with maybe_stage(metrics, "domain"):
+        domain = detect_domain(text)
+    return {
+        "text": text,
+        "hash": content_hash(text),
+        "sentences": merged["sentences"],
+        "sentence_kinds": merged["kinds"],                # "heading", "item" or "paragraph" per sentence
+        "freq": merged["freq"],                           # lowercase token frequencies
+        "keywords": keywords,                             # TF-IDF order, display spelling
+        "candidates": candidates,                         # 5+ letter keywords, same order
+        "neighbors": neighbors,                           # distractor index: term -> near-miss terms
+        "sentence_rank": order,                           # sentence indices, most central first
+        "main_ideas": [merged["sentences"][i] for i in order[:MAIN_IDEAS_KEEP]],
+        "patterns": merged["patterns"],
+        "domain": domain,
+        "stats": {                                        # size counters for instrumentation
+            "chars": len(text),
+            "chunks": len(chunks),
+            "chunks_reused": reused,
+            "sentences": len(merged["sentences"]),
+            "tokens": merged["tokens"],
+            "candidates": len(candidates),
+            "pattern_matches": sum(len(v) for v in merged["patterns"].values()),
+        },
+    }
+
+def ensure_analysis(text):
+    # generators accept raw text or an analyze_text() result
+    return text if isinstance(text, dict) else analyze_text(text)
+
+def extract_main_ideas(text, n=4):
+    # Take top n sentences as main ideas
+    return ensure_analysis(text)["main_ideas"][:n]
+
+def extract_good_keywords(text, n=8):
+    # distinctive terms first: TF-IDF against the background table (stop words and generic words excluded)
+    return ensure_analysis(text)["keywords"][:n]
+
+def extract_candidate_keywords(text, n=12):
+    scored = ensure_analysis(text)["candidates"]
+    # pick with filtering
+    filtered = []
+    for w in scored:
+        wl = w.lower()
+        if wl in EXTRA_COMMON_WORDS:
+            continue
+        if looks_technical(wl, w):
+            filtered.append(w)
+        if len(filtered) >= n:
+            break
+    # fallback if too strict
+    if not filtered:
+        filtered = scored[:n]
+    return filtered[:n]
@@ -0,0 +1,70 @@
+# In-process result cache
+
+import threading
+from collections import OrderedDict
+
+from .compact import deep_sizeof
+
+RESULT_CACHE_SIZE = 256  # entries shared by all sessions of this server process
+RESULT_CACHE_BYTES = 128 * 1024 * 1024   # and their approximate size: one analyzed course pack can be tens of MB
+CHUNK_CACHE_SIZE = 2048  # per-chunk analyses kept for incremental re-analysis of edited notes
+CHUNK_CACHE_BYTES = 64 * 1024 * 1024
+
+class LRUCache:
+    """Thread-safe bounded mapping; the least recently used entry is evicted first. With maxbytes, the
+    entries' approximate total size (deep_sizeof, measured once per put) is bounded too."""
+
+    def __init__(self, maxsize=RESULT_CACHE_SIZE, maxbytes=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = deep_sizeof(value) if self.maxbytes else 0
+        with self._lock:
+            self._discard(key)
+            if self.maxbytes and size > self.maxbytes:
+                return   # larger than the whole cache: keeping it would evict everything else
+            self._data[key] = value
+            self._sizes[key] = size
+            self.bytes += size
+            while len(self._data) > self.maxsize or (self.maxbytes and self.bytes > self.maxbytes):
+                self._discard(next(iter(self._data)))
+
+    def _discard(self, key):
+        # caller holds the lock
+        if key in self._data:
+            del self._data[key]
+            self.bytes -= self._sizes.pop(key)
+
+    def get_or_compute(self, key, compute):
+        # compute outside the lock so one slow generator doesn't block other sessions
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.bytes = 0
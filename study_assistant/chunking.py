@@ -0,0 +1,81 @@
+# Chunked map-reduce support: cut large notes into bounded pieces and map a function over them
+# in a process pool. The merge (reduce) side lives next to the data it merges (analysis.py).
+
+import multiprocessing, os, re, threading, zlib
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK_CHARS = 256 * 1024               # target chunk size
+PARALLEL_MIN_CHARS = 2 * 1024 * 1024   # smaller inputs are mapped in-process
+CHUNK_WORKERS = min(8, os.cpu_count() or 1)
+EDIT_CHUNK_SENTENCES = 32              # content-defined chunks end after ~1 in 32 sentences ...
+EDIT_CHUNK_MIN_CHARS = 1024            # ... but are never shorter than this
+
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+LINE_END_RE = re.compile(r'(?<=[.!?])[^\S\n\f]*[\n\f]\s*')   # a sentence that also ends its line
+WHITESPACE_RE = re.compile(r'\s+')
+
+def split_chunks(text, max_chars=CHUNK_CHARS):
+    """Cut text into pieces of about max_chars, ending at a sentence boundary when there is one
+    in the window (preferably at a line end, else at whitespace), so split_sentences() gives the same
+    sentences and structure segments per chunk."""
+    chunks = []
+    start, n = 0, len(text)
+    while n - start > max_chars:
+        window_end = start + max_chars
+        cut = None
+        for rx in (LINE_END_RE, SENTENCE_END_RE, WHITESPACE_RE):
+            # last boundary in the second half of the window
+            for m in rx.finditer(text, start + max_chars // 2, window_end):
+                cut = m.end()
+            if cut:
+                break
+        cut = cut or window_end
+        chunks.append(text[start:cut])
+        start = cut
+    if start < n or not chunks:
+        chunks.append(text[start:])
+    return chunks
+
+def content_chunks(text, max_chars=CHUNK_CHARS):
+    """Content-defined chunks for incremental re-analysis: a chunk ends after a sentence whose hash
+    picks it as a boundary, so cuts depend only on nearby text and an edit changes only the chunks
+    it touches (plus at most one neighbour). Cuts are sentence ends (line ends when the text has line
+    structure, so headings and list items are seen the same way); oversized pieces go through split_chunks()."""
+    chunks = []
+    start = prev = 0
+    boundary_re = LINE_END_RE if "\n" in text or "\f" in text else SENTENCE_END_RE
+    for m in boundary_re.finditer(text):
+        sentence = text[prev:m.start()]
+        prev = m.end()
+        if m.end() - start >= EDIT_CHUNK_MIN_CHARS and zlib.crc32(sentence.encode("utf-8", "ignore")) % EDIT_CHUNK_SENTENCES == 0:
+            chunks.extend(split_chunks(text[start:m.end()], max_chars))
+            start = m.end()
+    if start < len(text) or not chunks:
+        chunks.extend(split_chunks(text[start:], max_chars))
+    return chunks
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool(workers=CHUNK_WORKERS):
+    # one long-lived pool per process; "spawn" is safe inside threaded servers such as Streamlit
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def map_chunks(fn, chunks, total_chars=None, workers=CHUNK_WORKERS):
+    """[fn(c) for c in chunks], in a process pool when the input is large enough to pay for it.
+    Daemonic processes (e.g. CLI pool workers) cannot start children and always map in-process."""
+    total_chars = total_chars if total_chars is not None else sum(len(c) for c in chunks)
+    if workers <= 1 or len(chunks) < 2 or total_chars < PARALLEL_MIN_CHARS or multiprocessing.current_process().daemon:
+        return [fn(c) for c in chunks]
+    global _pool
+    try:
+        return list(get_pool(workers).map(fn, chunks))
+    except Exception:
+        # broken pool (e.g. a killed worker): drop it and fall back to the serial path
+        with _pool_lock:
+            _pool = None
+        return [fn(c) for c in chunks]
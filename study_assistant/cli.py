@@ -0,0 +1,131 @@
+# Batch CLI: turn a directory of .txt/.pdf notes into JSON study packs using all cores.
+#
+#   python -m study_assistant notes/ -o packs/ --workers 8 --seed 2025
+#   python -m study_assistant notes/ -o packs/ --variants 40 --seed midterm   # + 40 quiz versions per file (JSONL)
+#   python -m study_assistant notes/ -o packs/ --library                      # + index every file in the course library
+
+import argparse, json, os, random, sys, time
+from multiprocessing import Pool
+
+from .text import clean_text
+from .ingest import read_path
+from .analysis import analyze_text, extract_candidate_keywords
+from .generators import generate_summary, generate_gpt_style_questions, generate_exam_style_mcqs, default_flashcards
+from .store import ArtifactStore, stored_call, default_store_path
+from .variants import generate_quiz_variants, write_jsonl, VARIANT_QUESTIONS
+from .library import Library, default_library_path
+
+INPUT_EXTENSIONS = (".txt", ".pdf")
+
+def find_inputs(root):
+    if os.path.isfile(root):
+        return [root]
+    paths = []
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            if name.lower().endswith(INPUT_EXTENSIONS):
+                paths.append(os.path.join(dirpath, name))
+    return sorted(paths)
+
+def build_pack(text, questions=6, min_q=5, store=None, doc=None):
+    # with a store, artifacts are looked up / saved under the same keys the app uses
+    doc = doc or analyze_text(clean_text(text))
+    def call(fn, **kwargs):
+        return stored_call(store, fn, doc, **kwargs) if store else fn(doc, **kwargs)
+    summary, insight = call(generate_summary)
+    qlist, _ = call(generate_gpt_style_questions, count=questions)
+    return {
+        "domain": doc["domain"],
+        "content_hash": doc["hash"],
+        "summary": summary,
+        "insight": insight,
+        "keywords": call(extract_candidate_keywords, n=8),
+        "questions": qlist,
+        "mcqs": call(generate_exam_style_mcqs, min_q=min_q),
+        "flashcards": call(default_flashcards, n=5),
+    }
+
+_worker_store = None
+
+def worker_store(path):
+    # one SQLite connection per worker process
+    global _worker_store
+    if path and _worker_store is None:
+        _worker_store = ArtifactStore(path)
+    return _worker_store
+
+_worker_library = None
+
+def worker_library(path):
+    global _worker_library
+    if path and _worker_library is None:
+        _worker_library = Library(path)
+    return _worker_library
+
+def process_file(job):
+    # runs in a worker process: the pool parallelizes across files
+    path, out_dir, root, opts = job
+    start = time.perf_counter()
+    rel = os.path.relpath(path, root) if os.path.isdir(root) else os.path.basename(path)
+    if opts["seed"] is not None:
+        random.seed(f"{opts['seed']}:{rel}")
+    text = read_path(path)
+    if not text.strip():
+        return rel, None, "no extractable text"
+    doc = analyze_text(clean_text(text))
+    pack = build_pack(text, questions=opts["questions"], min_q=opts["min_q"], store=worker_store(opts["store"]), doc=doc)
+    pack["source"] = rel
+    if opts["library"]:
+        worker_library(opts["library"]).add(rel, text, doc=doc)
+    out_path = os.path.join(out_dir, os.path.splitext(rel)[0] + ".json")
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(pack, f, ensure_ascii=False, indent=2)
+    if opts["variants"]:
+        # quiz versions reuse the same analysis; seeded per file so each document gets its own set
+        seed = f"{opts['seed'] if opts['seed'] is not None else 0}:{rel}"
+        with open(os.path.splitext(out_path)[0] + ".variants.jsonl", "w", encoding="utf-8") as f:
+            write_jsonl(generate_quiz_variants(doc, opts["variants"], seed=seed, questions=opts["variant_questions"]), f)
+    return rel, out_path, f"{time.perf_counter() - start:.2f}s"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="study_assistant", description="Generate summaries, questions and MCQs for a directory of notes.")
+    ap.add_argument("input", help="a .txt/.pdf file or a directory searched recursively")
+    ap.add_argument("-o", "--output", default="study_packs", help="output directory for the JSON files (default: study_packs)")
+    ap.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+    ap.add_argument("--questions", type=int, default=6, help="open questions per document")
+    ap.add_argument("--min-q", type=int, default=5, help="minimum MCQs per document")
+    ap.add_argument("--seed", help="make MCQ option order (and quiz variants) reproducible")
+    ap.add_argument("--variants", type=int, default=0, help="also write this many quiz variants per document as JSON Lines")
+    ap.add_argument("--variant-questions", type=int, default=VARIANT_QUESTIONS, help="questions per quiz variant")
+    ap.add_argument("--store", nargs="?", const=default_store_path(), default=None,
+                    help="also save artifacts to the app's on-disk store (default path when no value is given)")
+    ap.add_argument("--library", nargs="?", const=default_library_path(), default=None,
+                    help="also add every document to the course library (default path when no value is given)")
+    args = ap.parse_args(argv)
+
+    paths = find_inputs(args.input)
+    if not paths:
+        print(f"No .txt/.pdf files found in {args.input}", file=sys.stderr)
+        return 1
+    opts = {
+        "questions": args.questions, "min_q": args.min_q, "seed": args.seed, "store": args.store,
+        "variants": args.variants, "variant_questions": args.variant_questions, "library": args.library,
+    }
+    jobs = [(p, args.output, args.input, opts) for p in paths]
+    failed = 0
+    pool = Pool(processes=min(args.workers, len(jobs))) if args.workers > 1 and len(jobs) > 1 else None
+    try:
+        results = pool.imap_unordered(process_file, jobs) if pool else map(process_file, jobs)
+        for rel, out_path, info in results:
+            failed += out_path is None
+            print(f"{rel} -> {out_path or 'skipped'} ({info})")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    print(f"Processed {len(paths) - failed}/{len(paths)} files into {args.output}")
+    return 0 if failed < len(paths) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# Compact session records: quizzes and flashcards as __slots__ objects with interned strings
+# Hundreds of Streamlit sessions on one host hold these in st.session_state, so each MCQ keeps its options
+# once (the answer is an index into them), selections are an array of option indices, and identical
+# strings across sessions share one object.
+
+import sys, uuid
+from array import array
+
+NO_ANSWER = -1   # selection value for "nothing chosen yet"
+PLACEHOLDER_DEFINITION = "Add your own definition."   # new cards until the student writes one
+
+def _intern(s):
+    return sys.intern(s) if isinstance(s, str) else s
+
+class MCQ:
+    __slots__ = ("question", "options", "answer_index", "concept")
+
+    def __init__(self, question, options, answer_index, concept=""):
+        self.question = _intern(question)
+        self.options = tuple(_intern(o) for o in options)
+        self.answer_index = answer_index
+        self.concept = _intern(concept)
+
+    @property
+    def answer(self):
+        return self.options[self.answer_index]
+
+    @classmethod
+    def from_dict(cls, d):
+        # generator output: {"question", "options", "answer", "concept"}; the answer is one of the options
+        options = list(d.get("options") or [])
+        if d["answer"] not in options:
+            options.append(d["answer"])
+        return cls(d["question"], options, options.index(d["answer"]), d.get("concept", ""))
+
+    def as_dict(self):
+        return {"question": self.question, "options": list(self.options), "answer": self.answer, "concept": self.concept}
+
+class Flashcard:
+    __slots__ = ("id", "term", "definition", "note")
+
+    def __init__(self, term, definition="", note="", id=None):
+        self.id = id or uuid.uuid4().hex[:16]   # stable across edits: the card's key in the review deck
+        self.term = _intern(term)
+        self.definition = _intern(definition)
+        self.note = note
+
+    @property
+    def written(self):
+        # only cards with a definition of the student's own go into the review deck
+        return bool(self.definition.strip()) and self.definition != PLACEHOLDER_DEFINITION
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d.get("term", ""), d.get("definition", ""), d.get("note", ""), d.get("id"))
+
+    def as_dict(self):
+        return {"id": self.id, "term": self.term, "definition": self.definition, "note": self.note}
+
+def compact_mcqs(items):
+    return [MCQ.from_dict(d) for d in items]
+
+def compact_flashcards(items):
+    return [Flashcard.from_dict(d) for d in items]
+
+def new_selection(n):
+    # one signed 16-bit option index per question
+    return array("h", [NO_ANSWER] * n)
+
+# ---------- Memory report ----------
+def deep_sizeof(obj, seen=None):
+    """Approximate bytes reachable from obj (containers, __dict__ and __slots__); shared objects,
+    such as interned strings, are counted once per call."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, array)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_sizeof(x, seen) for x in obj)
+    for name in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, name):
+            size += deep_sizeof(getattr(obj, name), seen)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+def session_memory(state):
+    """{key: approximate bytes} for a session-state mapping, largest first."""
+    sizes = {str(k): deep_sizeof(state[k]) for k in list(state.keys())}
+    return dict(sorted(sizes.items(), key=lambda kv: -kv[1]))
@@ -0,0 +1,86 @@
+# Distractor index: near-miss terms for MCQ options, built once per document
+# Terms are compared by character trigrams ("mitosis" ~ "meiosis", "glycolysis" ~ "glycogen") through an
+# inverted index (or one NumPy matrix product), built once per analysis; each question's lookup is a dict get.
+
+import heapq, importlib.util
+from collections import defaultdict
+from itertools import chain
+
+from .text import WORD_RE
+
+# Optional NumPy: all pairwise trigram overlaps in one matrix product when it is available
+# (located at import, imported with the first vectorized call: importing the package stays cheap)
+_NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+DISTRACTOR_NEIGHBORS = 6   # near-miss terms kept per term
+DISTRACTOR_TERMS = 400     # indexed terms per document (best ranked first)
+
+def trigrams(term):
+    t = f" {term.lower()} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+def same_word(a, b):
+    # inflections of one word ("enzyme"/"enzymes") are not useful distractors for each other
+    a, b = a.lower(), b.lower()
+    short, long_ = sorted((a, b), key=len)
+    return long_.startswith(short) and len(long_) - len(short) <= 2
+
+def similar_terms(grams, postings, common, n):
+    """Per term, up to n other term indices by Dice similarity of trigram sets (ties: lower index first)."""
+    sizes = [len(g) for g in grams]
+    if _NUMPY_AVAILABLE:
+        import numpy as np
+        # incidence matrix terms x informative trigrams; shared-trigram counts for all pairs in one product
+        cols = {g: c for c, g in enumerate(g for g, ids in postings.items() if len(ids) <= common)}
+        m = np.zeros((len(grams), len(cols)), dtype=np.float32)
+        for i, g in enumerate(grams):
+            m[i, [cols[x] for x in g if x in cols]] = 1.0
+        size = np.asarray(sizes, dtype=np.float32)
+        dice = 2.0 * (m @ m.T) / (size[:, None] + size[None, :])
+        np.fill_diagonal(dice, 0.0)
+        order = np.argsort(-dice, axis=1, kind="stable")[:, :n]
+        return [[int(j) for j in row if dice[i, j] > 0] for i, row in enumerate(order)]
+    out = []
+    for i, g in enumerate(grams):
+        shared = defaultdict(int)
+        for gram in g:
+            if len(postings[gram]) <= common:
+                for j in postings[gram]:
+                    shared[j] += 1
+        shared.pop(i, None)
+        out.append(heapq.nsmallest(n, shared, key=lambda j: (-2.0 * shared[j] / (sizes[i] + sizes[j]), j)))
+    return out
+
+def build_distractor_index(terms, k=DISTRACTOR_NEIGHBORS):
+    """{lowercase term: up to k other terms, most similar first}. terms are in rank order (best first);
+    terms without enough trigram neighbours are filled from that order."""
+    uniq = list(dict.fromkeys(t for t in terms if t))[:DISTRACTOR_TERMS]
+    grams = [trigrams(t) for t in uniq]
+    postings = defaultdict(list)
+    for i, g in enumerate(grams):
+        for gram in g:
+            postings[gram].append(i)
+    # trigrams shared by a large share of the terms (" co", "ion") say little and dominate the cost
+    common = max(16, len(uniq) // 8)
+    index = {}
+    for i, scored in enumerate(similar_terms(grams, postings, common, 2 * k)):
+        term = uniq[i]
+        picked = []
+        for j in chain(scored, range(len(uniq))):
+            if len(picked) >= k:
+                break
+            if j != i and uniq[j] not in picked and not same_word(term, uniq[j]):
+                picked.append(uniq[j])
+        index.setdefault(term.lower(), picked)
+    return index
+
+def near_misses(doc, term, k=DISTRACTOR_NEIGHBORS):
+    """O(1) lookup of near-miss terms. A phrase outside the index ("Overuse of antibiotics") uses its
+    first indexed word; failing that, the document's top keywords. Words of the phrase itself are skipped."""
+    index = doc.get("neighbors", {})
+    found = index.get(term.lower())
+    if found is None:
+        words = [w.lower() for w in WORD_RE.findall(term) if w.lower() in index]
+        found = index[words[0]] if words else doc.get("keywords", [])[:k + 1]
+    phrase = term.lower()
+    return [t for t in found if t.lower() not in phrase and not same_word(t, term)][:k]
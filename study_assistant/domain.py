@@ -0,0 +1,155 @@
+# Domain detection: weighted subject vocabularies matched in a single pass over the text
+# Vocabularies are plain-text files (study_assistant/domains/<domain>.txt, shipped prebuilt in the lexicon
+# resource, plus any directories listed in STUDY_ASSISTANT_DOMAINS); all terms go into one token trie, so
+# the cost of a scan depends on the text length and the longest term, not on how many terms are loaded.
+
+import os, re, threading
+
+DOMAINS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "domains")
+DOMAIN_PRIORITY = ("coding", "medical", "science")  # tie-break order; other domains follow by name
+DOMAIN_MIN_SCORE = 2.0                              # weighted distinct-term score needed to leave "generic"
+
+# lowercase word tokens; "c++" / "c#" keep their suffix, hyphens split ("x-ray" -> "x", "ray")
+TOKEN_RE = re.compile(r"[a-z0-9]+[+#]*")
+
+def parse_vocabulary(lines):
+    """Vocabulary file lines -> {term: weight}. One term per line with an optional trailing weight;
+    lines starting with # are comments."""
+    terms = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        term, weight = line, 1.0
+        parts = line.rsplit(None, 1)
+        if len(parts) == 2:
+            try:
+                term, weight = parts[0], float(parts[1])
+            except ValueError:
+                pass
+        terms[term.strip().lower()] = weight
+    return terms
+
+def load_vocabularies(dirs=None):
+    """{domain: {term: weight}} from every <domain>.txt in dirs (later directories extend / override)."""
+    if dirs is None:
+        extra = os.environ.get("STUDY_ASSISTANT_DOMAINS", "")
+        dirs = [DOMAINS_DIR] + [d for d in extra.split(os.pathsep) if d]
+    vocabularies = {}
+    for d in dirs:
+        if not os.path.isdir(d):
+            continue
+        for name in sorted(os.listdir(d)):
+            if name.endswith(".txt"):
+                with open(os.path.join(d, name), encoding="utf-8") as f:
+                    vocabularies.setdefault(name[:-4], {}).update(parse_vocabulary(f))
+    return vocabularies
+
+def plural_forms(word):
+    forms = {word, word + "s", word + "es"}
+    if word.endswith("y") and len(word) > 2:
+        forms.add(word[:-1] + "ies")
+    if word.endswith("is"):
+        forms.add(word[:-2] + "es")     # diagnosis -> diagnoses
+    if word.endswith("um"):
+        forms.add(word[:-2] + "a")      # bacterium -> bacteria
+    return forms
+
+class DomainMatcher:
+    """Token trie over all domain terms. Node = {token: child, None: [(domain, term), ...]}."""
+
+    def __init__(self, vocabularies=None):
+        self.root = {}
+        self.weights = {}   # (domain, term) -> weight
+        self.domains = []
+        for domain, terms in (vocabularies or {}).items():
+            self.add_domain(domain, terms)
+
+    def add_domain(self, domain, terms):
+        if domain not in self.domains:
+            self.domains.append(domain)
+        for term, weight in terms.items():
+            tokens = TOKEN_RE.findall(term.lower())
+            if not tokens:
+                continue
+            self.weights[(domain, term)] = weight
+            # the last word may appear in plural form
+            for last in plural_forms(tokens[-1]):
+                node = self.root
+                for tok in tokens[:-1] + [last]:
+                    node = node.setdefault(tok, {})
+                payload = node.setdefault(None, [])
+                if (domain, term) not in payload:
+                    payload.append((domain, term))
+
+    def find(self, text):
+        """{domain: {term: occurrences}} for every whole-word term occurrence, in one pass."""
+        tokens = TOKEN_RE.findall(text.lower())
+        root = self.root
+        n = len(tokens)
+        hits = {}
+        for i in range(n):
+            node = root.get(tokens[i])
+            j = i
+            while node is not None:
+                payload = node.get(None)
+                if payload:
+                    for domain, term in payload:
+                        found = hits.setdefault(domain, {})
+                        found[term] = found.get(term, 0) + 1
+                j += 1
+                if j >= n:
+                    break
+                node = node.get(tokens[j])
+        return hits
+
+    def scores(self, text):
+        # weighted count of distinct terms present, per domain
+        return {
+            domain: sum(self.weights[(domain, t)] for t in found)
+            for domain, found in self.find(text).items()
+        }
+
+    def best(self, scores, min_score=DOMAIN_MIN_SCORE):
+        ranked = [d for d, s in scores.items() if s >= min_score]
+        if not ranked:
+            return "generic"
+        order = {d: i for i, d in enumerate(DOMAIN_PRIORITY)}
+        return min(ranked, key=lambda d: (-scores[d], order.get(d, len(order)), d))
+
+def default_vocabularies():
+    # shipped domains from the prebuilt lexicon, then any STUDY_ASSISTANT_DOMAINS directories on top
+    from .lexicon import load_lexicon   # lexicon.py imports this module
+    vocabularies = {d: dict(terms) for d, terms in load_lexicon()["domains"].items()}
+    extra = [d for d in os.environ.get("STUDY_ASSISTANT_DOMAINS", "").split(os.pathsep) if d]
+    for domain, terms in load_vocabularies(extra).items():
+        vocabularies.setdefault(domain, {}).update(terms)
+    return vocabularies
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+def get_domain_matcher():
+    # built once per process from the vocabulary directories
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = DomainMatcher(default_vocabularies())
+        return _matcher
+
+def register_domain(name, terms):
+    """Add or extend a domain at runtime; terms is {term: weight} or an iterable of terms."""
+    if not isinstance(terms, dict):
+        terms = {t: 1.0 for t in terms}
+    matcher = get_domain_matcher()
+    with _matcher_lock:
+        matcher.add_domain(name, terms)
+
+def domain_scores(text):
+    """Weighted per-domain scores, e.g. {"science": 4.5, "medical": 1.0}."""
+    return get_domain_matcher().scores(text or "")
+
+def detect_domain(text):
+    # highest weighted score wins (ties: coding > medical > science > others by name); else generic
+    matcher = get_domain_matcher()
+    return matcher.best(matcher.scores(text or ""))
@@ -0,0 +1,150 @@
+# Analytics event log: quiz answers and flashcard reviews, buffered in memory and appended to SQLite in batches
+# record() only appends to a list, so a Submit click costs microseconds however many students submit at once;
+# a background thread writes the buffer every EVENT_FLUSH_SECONDS (sooner once EVENT_FLUSH_BATCH events are
+# waiting) in one transaction. Rows are never updated; aggregate queries read them back per concept.
+
+import atexit, json, os, sqlite3, threading, time
+
+from .store import data_dir
+
+EVENT_FLUSH_SECONDS = 2.0     # longest time an event waits in memory
+EVENT_FLUSH_BATCH = 500       # buffered events that trigger an early flush
+EVENT_BUFFER_MAX = 100000     # events held while the store is unavailable; older ones are dropped past this
+
+def default_events_path():
+    return os.path.join(data_dir(), "events.sqlite3")
+
+class EventLog:
+    """Append-only event store. record(kind, **fields) never blocks on I/O."""
+
+    def __init__(self, path=None, flush_seconds=EVENT_FLUSH_SECONDS, batch=EVENT_FLUSH_BATCH):
+        self.path = path or default_events_path()
+        self.flush_seconds = flush_seconds
+        self.batch = batch
+        self.written = 0
+        self.dropped = 0
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._db_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")   # WAL stays consistent; a crash loses the last batch at most
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                " id INTEGER PRIMARY KEY, ts REAL NOT NULL, kind TEXT NOT NULL, user TEXT, session TEXT,"
+                " doc_hash TEXT, concept TEXT, correct INTEGER, payload TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS events_kind_concept ON events (kind, concept)")
+        self._thread = threading.Thread(target=self._run, name="study-events", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, kind, **fields):
+        """Buffer one event. All fields go into the JSON payload; user, session, doc_hash, concept and
+        correct are also stored as columns, so aggregate queries need no JSON parsing."""
+        event = (time.time(), kind, fields)
+        with self._buffer_lock:
+            self._buffer.append(event)
+            n = len(self._buffer)
+            if n > EVENT_BUFFER_MAX:
+                del self._buffer[:n - EVENT_BUFFER_MAX]
+                self.dropped += n - EVENT_BUFFER_MAX
+        if n >= self.batch:
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass   # kept in the buffer (up to EVENT_BUFFER_MAX) and retried on the next cycle
+
+    def flush(self):
+        """Write every buffered event in one transaction; returns how many were written."""
+        with self._db_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            rows = [
+                (ts, kind, fields.get("user"), fields.get("session"), fields.get("doc_hash"), fields.get("concept"),
+                 None if fields.get("correct") is None else int(bool(fields["correct"])),
+                 json.dumps(fields, ensure_ascii=False, default=str))
+                for ts, kind, fields in batch
+            ]
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO events (ts, kind, user, session, doc_hash, concept, correct, payload)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows,
+                    )
+            except sqlite3.Error:
+                with self._buffer_lock:
+                    self._buffer[:0] = batch
+                raise
+            self.written += len(rows)
+            return len(rows)
+
+    # ---------- Queries ----------
+    def _query(self, sql, params):
+        # reads only what the background writer has stored (at most EVENT_FLUSH_SECONDS behind), so a query
+        # never writes on the caller's thread; call flush() first to include the buffered events
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def concept_accuracy(self, doc_hash=None, since=None, min_attempts=1):
+        """Quiz answers per concept across students, weakest first:
+        [{concept, attempts, correct, accuracy, students}]."""
+        where, params = ["kind = 'answer'", "concept IS NOT NULL"], []
+        if doc_hash:
+            where.append("doc_hash = ?")
+            params.append(doc_hash)
+        if since:
+            where.append("ts >= ?")
+            params.append(since)
+        rows = self._query(
+            "SELECT concept, COUNT(*), SUM(correct), COUNT(DISTINCT COALESCE(user, '') || '/' || COALESCE(session, ''))"
+            f" FROM events WHERE {' AND '.join(where)} GROUP BY concept HAVING COUNT(*) >= ?",
+            params + [min_attempts],
+        )
+        out = [
+            {"concept": c, "attempts": n, "correct": ok or 0, "accuracy": (ok or 0) / n, "students": students}
+            for c, n, ok, students in rows
+        ]
+        return sorted(out, key=lambda r: (r["accuracy"], -r["attempts"], r["concept"]))
+
+    def review_stats(self, user=None):
+        """Flashcard reviews per card: [{concept, reviews, lapses, last}], most lapses first."""
+        where, params = "kind = 'review'", []
+        if user:
+            where += " AND user = ?"
+            params.append(user)
+        rows = self._query(
+            f"SELECT concept, COUNT(*), SUM(correct = 0), MAX(ts) FROM events WHERE {where} GROUP BY concept", params
+        )
+        out = [{"concept": c, "reviews": n, "lapses": lapses or 0, "last": last} for c, n, lapses, last in rows]
+        return sorted(out, key=lambda r: (-r["lapses"], r["concept"]))
+
+    def stats(self):
+        with self._buffer_lock:
+            buffered = len(self._buffer)
+        return {"buffered": buffered, "written": self.written, "dropped": self.dropped}
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        try:
+            self.flush()
+        finally:
+            with self._db_lock:
+                self._conn.close()
@@ -0,0 +1,293 @@
+# Summary / question / MCQ / flashcard generators
+
+import random, textwrap
+
+from .analysis import ensure_analysis, extract_candidate_keywords, extract_main_ideas, extract_good_keywords
+from .distractors import near_misses
+from .summarize import select_summary, SUMMARY_WORDS, SUMMARY_MAX_SENTENCES
+from .templates import create_question_templates, DISTRACTOR_PATTERNS
+from .compact import PLACEHOLDER_DEFINITION
+
+def generate_summary(text, max_words=SUMMARY_WORDS, max_sentences=SUMMARY_MAX_SENTENCES):
+    """Extractive summary: the most central sentences (TextRank) within the length budget."""
+    doc = ensure_analysis(text)
+    if not doc["text"]:
+        return "", ""
+    keywords = extract_candidate_keywords(doc, n=6)
+    if not keywords:
+        keywords = ["concept", "principle", "application"]
+    main = keywords[0]
+    context = ", ".join(keywords[1:4])
+
+    summary = " ".join(select_summary(doc["sentences"], doc["sentence_rank"], max_words, max_sentences, doc["sentence_kinds"]))
+    insight = f"Focus on how {main} relates to {context} — it often forms the key link for exam answers."
+    return textwrap.fill(summary, 100), insight
+
+def generate_gpt_style_questions(text, count=6):
+    """
+    Generate diverse, context-aware, exam-style questions from the input text.
+    """
+    doc = ensure_analysis(text)
+    if not doc["text"] or len(doc["text"].strip()) < 20:
+        return ["Provide more content to generate meaningful questions."], []
+
+    main_ideas = extract_main_ideas(doc, n=3)
+    keywords = extract_good_keywords(doc, n=8)
+    patterns = doc["patterns"]
+    questions = []
+    used = set()
+
+    # Question templates, but more dynamic and context-aware
+    def q_define(term): return f"What is '{term}'? Explain in your own words."
+    def q_significance(term): return f"Why is '{term}' significant in the context of this topic?"
+    def q_application(term): return f"Describe a real-world application or example of '{term}'."
+    def q_compare(term1, term2): return f"Compare and contrast '{term1}' and '{term2}'."
+    def q_explain_sentence(sent): return f"Explain the meaning of the following statement: \"{sent}\""
+    def q_process(term): return f"Describe the process or steps involved in '{term}'."
+    def q_problem(term): return f"What problems or challenges are associated with '{term}'?"
+    def q_why(sent): return f"Why is the following point important: \"{sent}\""
+    def q_how(term): return f"How does '{term}' contribute to the overall understanding of the topic?"
+
+    # Priority 1: pattern-based questions for deeper understanding
+    for term, defin in patterns.get("definitions", [])[:2]:
+        q = f"Define '{term}' in simple terms and give one key point."
+        if q not in used:
+            questions.append(q); used.add(q)
+            if len(questions) >= count: return questions, keywords
+    for cause, effect in patterns.get("causes", [])[:2]:
+        q = f"How does '{cause}' lead to '{effect}'? Explain the reasoning."
+        if q not in used:
+            questions.append(q); used.add(q)
+            if len(questions) >= count: return questions, keywords
+    for a, b in patterns.get("contrasts", [])[:2]:
+        q = f"Contrast '{a}' and '{b}' with one real-world difference."
+        if q not in used:
+            questions.append(q); used.add(q)
+            if len(questions) >= count: return questions, keywords
+    for topic, ex in patterns.get("examples", [])[:2]:
+        q = f"Give two examples of '{topic}' and state why they fit."
+        if q not in used:
+            questions.append(q); used.add(q)
+            if len(questions) >= count: return questions, keywords
+    for topic, items in patterns.get("enumerations", [])[:1]:
+        q = f"List three items under '{topic}' and explain each in one line."
+        if q not in used:
+            questions.append(q); used.add(q)
+            if len(questions) >= count: return questions, keywords
+    for label, steps in patterns.get("processes", [])[:1]:
+        q = f"Outline the main steps of the process and the goal of each step."
+        if q not in used:
+            questions.append(q); used.add(q)
+            if len(questions) >= count: return questions, keywords
+
+    # Priority 2: main idea prompts
+    for sent in main_ideas:
+        q = q_explain_sentence(sent) if len(questions) % 2 == 0 else q_why(sent)
+        if q not in used:
+            questions.append(q); used.add(q)
+            if len(questions) >= count: return questions, keywords
+
+    # Priority 3: keyword-based diverse prompts
+    qtypes = [q_define, q_significance, q_application, q_process, q_problem, q_how]
+    for i, term in enumerate(keywords):
+        q = qtypes[i % len(qtypes)](term)
+        if q not in used:
+            questions.append(q); used.add(q)
+            if len(questions) >= count: return questions, keywords
+
+    # Fallbacks
+    while len(questions) < count:
+        q = "Summarize the main points of the passage in your own words."
+        if q not in used:
+            questions.append(q); used.add(q)
+        else:
+            break
+
+    return questions, keywords
+
+def generate_mcqs(text, min_q=5, rng=None):
+    # determine number of questions: at least min_q, increase with content length
+    rng = rng or random  # a seeded random.Random gives a reproducible quiz
+    doc = ensure_analysis(text)
+    words = extract_candidate_keywords(doc, n=20)
+    num = max(min_q, min(12, max(0, len(words)//2)))
+    domain = doc["domain"]
+    templates = create_question_templates(domain)
+    mcqs = []
+    keys = words[:num]
+    if not keys:
+        keys = ["ConceptA","ConceptB","ConceptC","ConceptD","ConceptE"]
+    for key in keys:
+        question = rng.choice(templates).format(k=key)
+        # correct answer: short context-based line
+        correct = f"{key} refers to a central concept that explains an important idea or role in this topic."
+        # build distractors
+        pool = [k for k in keys if k != key]
+        wrongs = []
+        # smart distractor 1: pattern with key (but wrong)
+        wrongs.append(DISTRACTOR_PATTERNS[0].format(key))
+        # distractor 2: a lexically similar term from the distractor index, else another key
+        if pool:
+            other = rng.choice(near_misses(doc, key)[:3] or pool)
+            wrongs.append(f"{other} — a related term that may be confused with {key}.")
+        else:
+            wrongs.append(DISTRACTOR_PATTERNS[1].format(key))
+        # distractor 3: generic misleading statement
+        wrongs.append(DISTRACTOR_PATTERNS[2].format(key))
+        options = [correct] + wrongs
+        # make sure all options are distinct
+        unique_opts = []
+        for o in options:
+            o = o.strip()
+            if o not in unique_opts:
+                unique_opts.append(o)
+        # if less than 4 unique, add filler
+        fillers = ["A specific example rather than a definition.", "A method or procedure unrelated to the concept."]
+        while len(unique_opts) < 4:
+            unique_opts.append(fillers.pop(0))
+        rng.shuffle(unique_opts)
+        mcqs.append({
+            "question": question,
+            "options": unique_opts,
+            "answer": correct,
+            "concept": key
+        })
+    return mcqs
+
+def generate_exam_style_mcqs(text, min_q=5, rng=None):
+    """
+    Generate MCQs that are more exam-relevant, using main ideas and good keywords.
+    Returns up to min_q questions; short notes give fewer rather than repeated or placeholder ones.
+    rng: optional random.Random for reproducible distractors and option order (default: global random).
+    """
+    rng = rng or random
+    doc = ensure_analysis(text)
+    # pools sized to the request: a 20-question pool needs 20 distinct keywords and sentences
+    main_ideas = extract_main_ideas(doc, n=max(5, min_q))
+    keywords = extract_good_keywords(doc, n=max(10, min_q))
+    patterns = doc["patterns"]
+    mcqs = []
+    used_questions = set()
+    used_terms = set()
+    # Question stems
+    stems = [
+        lambda k, s: f"What is the best definition of '{k}'?",
+        lambda k, s: f"Which statement best describes the significance of '{k}'?",
+        lambda k, s: f"In the context of the passage, what is a key application of '{k}'?",
+        lambda k, s: f"Which of the following is most accurate about '{k}'?",
+        lambda k, s: f"Based on the passage, which is true regarding '{k}'?",
+        lambda k, s: f"According to the text, what is a challenge related to '{k}'?",
+        lambda k, s: f"Which option best explains the following statement: \"{s}\"",
+    ]
+    definitions = {t.lower(): d for t, d in patterns.get("definitions", [])}
+    # Helper to build plausible, professional distractors (near misses come from the document's distractor index)
+    def make_distractors(correct: str, keyword: str, pool_terms, pool_ideas, needed=3):
+        d = []
+        near = near_misses(doc, keyword)
+        # 1) Near-miss definitions: what a similar term in the passage means
+        for t in near:
+            other = definitions.get(t.lower())
+            if other:
+                d.append(other if len(other) <= 140 else other[:137] + "...")
+        # 2) Confuser using a lexically similar term
+        confusers = near[:3] or pool_terms
+        if confusers:
+            d.append(f"{rng.choice(confusers)} — closely related but not the same as {keyword}.")
+        # 3) Borrow a different main idea snippet
+        for idea in pool_ideas:
+            if keyword.lower() not in idea.lower():
+                d.append(idea if len(idea) < 120 else idea[:117] + "...")
+                break
+        # 4) Partial truth but incomplete
+        d.append(f"{keyword}: a related aspect mentioned indirectly, but not the full meaning.")
+        # 5) Opposite/negation or common misconception
+        d.append(f"A common misconception about {keyword}, not supported by the passage.")
+        # Trim to needed count and ensure uniqueness
+        uniq = []
+        for x in d:
+            if x and x != correct and x not in uniq:
+                uniq.append(x)
+        return uniq[:needed]
+
+    # 1) Definition-based MCQs
+    for term, defin in patterns.get("definitions", [])[:2]:
+        q = f"Which option best defines '{term}'?"
+        if q in used_questions: continue
+        used_questions.add(q)
+        correct = defin if len(defin) <= 140 else defin[:137] + "..."
+        pool_terms = [t for t, _ in patterns.get("definitions", []) if t != term]
+        pool_ideas = main_ideas
+        distractors = make_distractors(correct, term, pool_terms, pool_ideas, needed=3)
+        options = [correct] + distractors[:3]
+        rng.shuffle(options)
+        mcqs.append({"question": q, "options": options, "answer": correct, "concept": term})
+        if len(mcqs) >= min_q: return mcqs
+
+    # 2) Cause-effect MCQs
+    for cause, effect in patterns.get("causes", [])[:2]:
+        q = f"According to the passage, '{cause}' most directly leads to which outcome?"
+        if q in used_questions: continue
+        used_questions.add(q)
+        correct = effect
+        distractors = make_distractors(correct, cause, keywords, main_ideas, needed=3)
+        options = [correct] + distractors
+        rng.shuffle(options)
+        mcqs.append({"question": q, "options": options, "answer": correct, "concept": cause})
+        if len(mcqs) >= min_q: return mcqs
+
+    # 3) Contrast MCQs
+    for a, b in patterns.get("contrasts", [])[:2]:
+        q = f"Which option correctly distinguishes '{a}' from '{b}'?"
+        if q in used_questions: continue
+        used_questions.add(q)
+        correct = f"{a} differs from {b} in purpose or behavior as described."
+        distractors = make_distractors(correct, f"{a} vs {b}", keywords, main_ideas, needed=3)
+        options = [correct] + distractors
+        rng.shuffle(options)
+        mcqs.append({"question": q, "options": options, "answer": correct, "concept": f"{a} vs {b}"})
+        if len(mcqs) >= min_q: return mcqs
+
+    # 4) Enumeration MCQs
+    for topic, items in patterns.get("enumerations", [])[:1]:
+        q = f"Which of the following is listed as part of '{topic}' in the passage?"
+        if q in used_questions: continue
+        used_questions.add(q)
+        correct = items[0]
+        distractors = items[1:3]
+        while len(distractors) < 3:
+            distractors.append("A plausible but unlisted item from the same category")
+        options = [correct] + distractors[:3]
+        rng.shuffle(options)
+        mcqs.append({"question": q, "options": options, "answer": correct, "concept": topic})
+        if len(mcqs) >= min_q: return mcqs
+
+    # 5) Fallback: one question per keyword, each with its own main idea (preferably one that mentions it);
+    # ends when keywords or sentences run out rather than padding with placeholder questions
+    unused = list(main_ideas)
+    for i, k in enumerate(keywords):
+        if not unused:
+            break
+        s = next((x for x in unused if k.lower() in x.lower()), unused[0])
+        unused.remove(s)
+        stem = stems[i % len(stems)]
+        question = stem(k, s)
+        if question in used_questions: continue
+        used_questions.add(question)
+        correct = f"{k}: {s[:80]}..." if len(s) > 80 else f"{k}: {s}"
+        # near misses: the term paired with other main ideas, or confused with a similar term
+        distractors = [f"{k}: {x[:80]}..." if len(x) > 80 else f"{k}: {x}" for x in main_ideas if x != s and k.lower() not in x.lower()][:2]
+        near = near_misses(doc, k)
+        if near:
+            distractors.append(f"{k} is another name for {rng.choice(near[:3])}.")
+        distractors += [f"{k} is unrelated to the topic.", f"{k} is not mentioned.", f"{k} means the opposite."]
+        distractors = [x for x in dict.fromkeys(distractors) if x != correct][:3]
+        options = [correct] + distractors
+        rng.shuffle(options)
+        mcqs.append({"question": question, "options": options, "answer": correct, "concept": k})
+        if len(mcqs) >= min_q: break
+    return mcqs
+
+# ---------- Flashcards ----------
+def default_flashcards(text, n=5):
+    # Start with neutral placeholders so user decides the content
+    return [{"term": f"Topic {i+1}", "definition": PLACEHOLDER_DEFINITION, "note": ""} for i in range(n)]
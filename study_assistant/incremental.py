@@ -0,0 +1,30 @@
+# Incremental updates when notes are edited
+# Analysis reuse happens per chunk (analyze_text(..., chunk_cache=...)); this module decides whether new
+# input is an edit of the previous notes and carries the student's quiz answers over to the new quiz.
+
+from .text import split_sentences
+from .compact import NO_ANSWER, new_selection
+
+EDIT_MIN_OVERLAP = 0.5   # share of sentences two versions must have in common to count as an edit
+
+def sentence_overlap(old_text, new_text):
+    """Shared distinct sentences as a fraction of the smaller version (0.0 .. 1.0)."""
+    old, new = set(split_sentences(old_text)), set(split_sentences(new_text))
+    if not old or not new:
+        return 0.0
+    return len(old & new) / min(len(old), len(new))
+
+def is_edit(old_text, new_text):
+    return sentence_overlap(old_text, new_text) >= EDIT_MIN_OVERLAP
+
+def carry_over_answers(old_mcqs, old_sel, new_mcqs):
+    """Questions unchanged by the edit (same question and answer) keep their option order and the
+    selected answer; only the affected questions are new. MCQ records in, (records, selection array) out."""
+    previous = {(m.question, m.answer): (m, old_sel[i] if i < len(old_sel) else NO_ANSWER) for i, m in enumerate(old_mcqs)}
+    mcqs = []; sel = new_selection(len(new_mcqs))
+    for i, m in enumerate(new_mcqs):
+        prev = previous.get((m.question, m.answer))
+        if prev:
+            m, sel[i] = prev
+        mcqs.append(m)
+    return mcqs, sel
@@ -0,0 +1,65 @@
+# PDF / text ingestion (no Streamlit dependency)
+
+import importlib.util, io
+
+# Optional PDF support: PyPDF2 is only located at startup and imported with the first PDF
+_PDF_AVAILABLE = importlib.util.find_spec("PyPDF2") is not None
+_PdfReader = None
+
+def open_pdf(data):
+    global _PdfReader
+    if _PdfReader is None:
+        from PyPDF2 import PdfReader
+        _PdfReader = PdfReader
+    return _PdfReader(io.BytesIO(data))
+
+def iter_pdf_pages(data):
+    """Yield (page_index, page_count, text) as each page is extracted, so callers can show progress.
+    Pages are read serially: PyPDF2 extraction is pure Python, so threads only add contention and every
+    extra parser holds its own copy of the document. Batch runs parallelize across files instead."""
+    reader = open_pdf(data)
+    total = len(reader.pages)
+    for i, page in enumerate(reader.pages):
+        try:
+            txt = page.extract_text() or ""
+        except Exception:
+            txt = ""
+        yield i, total, txt
+
+def read_uploaded(u, on_page=None):
+    # on_page(page_index, page_count, pages_so_far) is called after every extracted PDF page
+    if not u:
+        return ""
+    name = u.name.lower()
+    try:
+        if name.endswith(".txt") or u.type == "text/plain":
+            raw = u.read()
+            if isinstance(raw, bytes):
+                return raw.decode("utf-8", errors="ignore")
+            return str(raw)
+        if name.endswith(".pdf") and _PDF_AVAILABLE:
+            pages = []
+            for i, total, txt in iter_pdf_pages(u.getvalue()):
+                if txt:
+                    pages.append(txt)
+                if on_page:
+                    on_page(i, total, pages)
+            return "\f".join(pages)  # page breaks survive clean_text()
+    except Exception:
+        return ""
+    return ""
+
+def read_path(path):
+    # file-system counterpart of read_uploaded() for batch use
+    name = path.lower()
+    try:
+        if name.endswith(".txt"):
+            with open(path, "rb") as f:
+                return f.read().decode("utf-8", errors="ignore")
+        if name.endswith(".pdf") and _PDF_AVAILABLE:
+            with open(path, "rb") as f:
+                data = f.read()
+            return "\f".join(txt for _, _, txt in iter_pdf_pages(data) if txt)
+    except Exception:
+        return ""
+    return ""
@@ -0,0 +1,135 @@
+# Background job queue
+# Generation runs on worker threads so a Streamlit rerun only polls job status and never waits for a
+# slow generator. Identical in-flight jobs are shared, and a job nobody waits for anymore is cancelled.
+
+import itertools, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = 2          # concurrent generation jobs per server process
+JOB_HISTORY = 128        # finished jobs kept for status lookups and deduplication
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    """One submitted call. The job function receives it as its first argument and may call
+    update() to report progress and check() between steps to honour cancellation."""
+
+    def __init__(self, job_id, key):
+        self.id = job_id
+        self.key = key
+        self.state = "queued"        # queued -> running -> done | failed | cancelled
+        self.progress = 0.0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+        self.waiters = 1             # callers sharing this job; cancelled when it drops to 0
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    def update(self, progress, message=""):
+        self.progress = min(1.0, max(0.0, progress))
+        self.message = message
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def as_dict(self):
+        return {
+            "id": self.id, "key": self.key, "state": self.state, "progress": self.progress,
+            "message": self.message, "error": self.error, "waiters": self.waiters,
+            "seconds": round((self.finished or time.time()) - self.submitted, 3),
+        }
+
+class JobQueue:
+    """Thread-pool executor with job IDs, progress, cancellation and deduplication by key."""
+
+    def __init__(self, workers=JOB_WORKERS, history=JOB_HISTORY):
+        self.history = history
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="study-job")
+        self._jobs = OrderedDict()   # id -> Job, oldest first
+        self._by_key = {}            # key -> id of the live or last successful job
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Run fn(job, *args, **kwargs) in the background. A queued, running or successfully finished
+        job with the same key is returned instead of starting a duplicate."""
+        with self._lock:
+            job = self._jobs.get(self._by_key.get(key))
+            if job is not None and job.state in ("queued", "running", "done"):
+                if job.state != "done":
+                    job.waiters += 1
+                return job
+            job = Job(f"job-{next(self._ids)}", key)
+            self._jobs[job.id] = job
+            self._by_key[key] = job.id
+            self._trim()
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        try:
+            job.check()
+            job.state = "running"
+            job.result = fn(job, *args, **kwargs)
+            job.update(1.0, job.message)
+            job.state = "done"
+        except JobCancelled:
+            job.state = "cancelled"
+        except Exception as e:
+            job.state = "failed"
+            job.error = f"{type(e).__name__}: {e}"
+        finally:
+            job.finished = time.time()
+            job._done.set()
+            if job.state != "done":
+                with self._lock:
+                    if self._by_key.get(job.key) == job.id:
+                        del self._by_key[job.key]
+
+    def _trim(self):
+        # drop the oldest finished jobs past the history limit (caller holds the lock)
+        excess = len(self._jobs) - self.history
+        for job_id in [j.id for j in self._jobs.values() if j.finished][:max(0, excess)]:
+            job = self._jobs.pop(job_id)
+            if self._by_key.get(job.key) == job_id:
+                del self._by_key[job.key]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id, timeout=None):
+        """Block up to timeout seconds for the job to finish; returns the job (or None if unknown)."""
+        job = self.get(job_id)
+        if job is not None:
+            job._done.wait(timeout)
+        return job
+
+    def cancel(self, job_id):
+        """Withdraw one caller's interest; the job is cancelled once no caller waits on it.
+        A running job stops at its next check()."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            job.waiters = max(0, job.waiters - 1)
+            if job.waiters:
+                return False
+            job._cancel.set()
+            if self._by_key.get(job.key) == job.id:
+                del self._by_key[job.key]
+            return True
+
+    def stats(self):
+        with self._lock:
+            states = [j.state for j in self._jobs.values()]
+        return {s: states.count(s) for s in ("queued", "running", "done", "failed", "cancelled")}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
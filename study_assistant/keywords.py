@@ -0,0 +1,23 @@
+# Keyword filtering primitives: stop-word tables and the technical-term test (ranking is TF-IDF, see tfidf.py)
+
+from .lexicon import load_lexicon
+
+# stop-word tables come from the prebuilt lexicon (resources/lexicon.json), loaded once per process
+_LEXICON = load_lexicon()
+
+COMMON_WORDS = set(_LEXICON["stopwords"])
+
+# Extra generic/common words to avoid as focus keywords
+EXTRA_COMMON_WORDS = set(_LEXICON["generic_words"])
+
+# technical preference
+DIFFICULT_SUFFIXES = (
+    "ology","ologies","itis","ase","osis","graphy","metry","dynamics","statics",
+    "lysis","genic","phobic","philia","ectomy","emia","algia","pathy","morphism","morphic",
+    "synthesis","kinetics","quantum","neural"
+)
+
+def looks_technical(wl, w):
+    return (
+        len(w) >= 7 or '-' in w or '/' in w or w.isupper() or wl.endswith(DIFFICULT_SUFFIXES)
+    )
@@ -0,0 +1,68 @@
+# Prebuilt lexicon: stop-word tables and the shipped domain vocabularies in one compact JSON resource
+# resources/lexicon.json is built from resources/stopwords.txt, resources/generic_words.txt and domains/*.txt
+# by tools/build_lexicon.py and read once per process. It records a hash of its sources; when it is missing
+# or the sources have changed since, they are parsed instead (same tables, a few milliseconds slower).
+# Content hashes rather than mtimes: a checkout or copy sets mtimes in write order, not edit order.
+
+import hashlib, json, os, threading
+
+from .domain import DOMAINS_DIR, load_vocabularies
+
+RESOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
+LEXICON_PATH = os.path.join(RESOURCES_DIR, "lexicon.json")
+WORD_LISTS = {
+    "stopwords": os.path.join(RESOURCES_DIR, "stopwords.txt"),          # never keywords or index terms
+    "generic_words": os.path.join(RESOURCES_DIR, "generic_words.txt"),  # poor focus keywords
+}
+
+_lexicon = None
+_lexicon_lock = threading.Lock()
+
+def read_word_list(path):
+    # whitespace-separated words; lines starting with # are comments
+    with open(path, encoding="utf-8") as f:
+        return sorted({w.lower() for line in f if not line.lstrip().startswith("#") for w in line.split()})
+
+def domain_files():
+    return sorted(n for n in os.listdir(DOMAINS_DIR) if n.endswith(".txt"))
+
+def source_hash():
+    # names and contents of every source file (line endings normalized, so a CRLF checkout still matches)
+    h = hashlib.sha256()
+    sources = [(os.path.basename(p), p) for p in WORD_LISTS.values()]
+    sources += [("domains/" + n, os.path.join(DOMAINS_DIR, n)) for n in domain_files()]
+    for name, path in sources:
+        with open(path, "rb") as f:
+            data = f.read().replace(b"\r\n", b"\n")
+        h.update(f"{name}\0{len(data)}\0".encode())
+        h.update(data)
+    return h.hexdigest()
+
+def build_lexicon():
+    """{"stopwords": [...], "generic_words": [...], "domains": {domain: {term: weight}}, "source_hash": ...}
+    from the sources."""
+    lexicon = {name: read_word_list(path) for name, path in WORD_LISTS.items()}
+    lexicon["domains"] = load_vocabularies([DOMAINS_DIR])
+    lexicon["source_hash"] = source_hash()
+    return lexicon
+
+def _is_current(lexicon):
+    # built from exactly the sources on disk now
+    return lexicon.get("source_hash") == source_hash()
+
+def load_lexicon(path=None):
+    """The lexicon; the default resource is loaded once per process."""
+    global _lexicon
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    with _lexicon_lock:
+        if _lexicon is None:
+            try:
+                lexicon = load_lexicon(LEXICON_PATH)
+                if not _is_current(lexicon):
+                    lexicon = build_lexicon()
+            except (OSError, ValueError):
+                lexicon = build_lexicon()
+            _lexicon = lexicon
+        return _lexicon
@@ -0,0 +1,212 @@
+# Course library: a persistent inverted index over many documents' sentences (SQLite)
+# Each document is analyzed once when it is added; its sentences (with their offsets in the normalized
+# text) and term -> (document, sentence) postings are stored. Search and topic quizzes then read only the
+# matching sentences instead of re-parsing every document.
+#
+#   lib = Library()
+#   lib.add("week1.pdf", read_path("week1.pdf"))
+#   lib.search("photosynthesis")                          # ranked sentences across the course
+#   generate_exam_style_mcqs(lib.topic("photosynthesis"))  # generators accept the topic analysis
+
+import json, math, os, sqlite3, threading, time
+from collections import Counter, defaultdict
+
+from .text import clean_text, content_hash, WORD_RE
+from .analysis import analyze_text, KEYWORD_STOPLIST
+from .cache import LRUCache
+from .store import data_dir
+
+LIBRARY_DOC_KEYWORDS = 20    # top keywords stored per document
+TOPIC_SENTENCES = 200        # matching sentences a topic analysis is built from (best first)
+TOPIC_CACHE_SIZE = 64        # topic analyses kept in memory
+
+def default_library_path():
+    return os.path.join(data_dir(), "library.sqlite3")
+
+def index_terms(text):
+    # the indexed vocabulary: lowercase 4+ letter tokens, stop words and generic words excluded
+    return [w for w in (w.lower() for w in WORD_RE.findall(text)) if w not in KEYWORD_STOPLIST]
+
+def sentence_offsets(text, sentences):
+    """(start, end) of each split_sentences() sentence in normalized text. Sentences differ from their
+    source span only by line and page breaks turned into spaces, so lengths match."""
+    out = []
+    pos = 0
+    for s in sentences:
+        start = text.find(s.split(" ", 1)[0], pos)
+        if start < 0:
+            start = pos
+        out.append((start, start + len(s)))
+        pos = start + len(s)
+    return out
+
+class Library:
+    """Documents, their sentences and a term -> sentence inverted index in one SQLite file."""
+
+    def __init__(self, path=None):
+        self.path = path or default_library_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._topics = LRUCache(maxsize=TOPIC_CACHE_SIZE)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " id INTEGER PRIMARY KEY, name TEXT NOT NULL, content_hash TEXT NOT NULL UNIQUE,"
+                " sentences INTEGER NOT NULL, keywords TEXT NOT NULL, added REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentences ("
+                " doc_id INTEGER NOT NULL, idx INTEGER NOT NULL, start INTEGER NOT NULL, end INTEGER NOT NULL,"
+                " text TEXT NOT NULL, PRIMARY KEY (doc_id, idx)) WITHOUT ROWID"
+            )
+            # clustered by term: a lookup is one range scan
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS postings ("
+                " term TEXT NOT NULL, doc_id INTEGER NOT NULL, idx INTEGER NOT NULL, tf INTEGER NOT NULL,"
+                " PRIMARY KEY (term, doc_id, idx)) WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID"
+            )
+            self._version = self._conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM documents").fetchone()
+
+    # ---------- Documents ----------
+    def add(self, name, text, doc=None):
+        """Index a document (raw text, or pass its analyze_text() result as doc); returns its id.
+        Content already in the library is not indexed twice."""
+        if doc is None:
+            text = clean_text(text)
+            h = content_hash(text)
+        else:
+            text, h = doc["text"], doc["hash"]
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM documents WHERE content_hash=?", (h,)).fetchone()
+        if row:
+            return row[0]
+        doc = doc or analyze_text(text)
+        sentences = doc["sentences"]
+        postings = []
+        df = Counter()
+        for i, s in enumerate(sentences):
+            counts = Counter(index_terms(s))
+            df.update(counts.keys())
+            postings.extend((term, i, tf) for term, tf in counts.items())
+        with self._lock, self._conn:
+            # another thread may have added the same content while this one analyzed it
+            cur = self._conn.execute(
+                "INSERT INTO documents (name, content_hash, sentences, keywords, added) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(content_hash) DO NOTHING",
+                (name, h, len(sentences), json.dumps(doc["keywords"][:LIBRARY_DOC_KEYWORDS]), time.time()),
+            )
+            if not cur.rowcount:
+                return self._conn.execute("SELECT id FROM documents WHERE content_hash=?", (h,)).fetchone()[0]
+            doc_id = cur.lastrowid
+            self._conn.executemany(
+                "INSERT INTO sentences VALUES (?, ?, ?, ?, ?)",
+                [(doc_id, i, a, b, s) for i, (s, (a, b)) in enumerate(zip(sentences, sentence_offsets(text, sentences)))],
+            )
+            self._conn.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)", [(t, doc_id, i, tf) for t, i, tf in postings])
+            self._conn.executemany(
+                "INSERT INTO terms VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df", df.items()
+            )
+            self._changed()
+        return doc_id
+
+    def remove(self, doc_id):
+        with self._lock, self._conn:
+            df = self._conn.execute(
+                "SELECT term, COUNT(*) FROM postings WHERE doc_id=? GROUP BY term", (doc_id,)
+            ).fetchall()
+            self._conn.executemany("UPDATE terms SET df = df - ? WHERE term=?", [(n, t) for t, n in df])
+            self._conn.execute("DELETE FROM terms WHERE df <= 0")
+            self._conn.execute("DELETE FROM postings WHERE doc_id=?", (doc_id,))
+            self._conn.execute("DELETE FROM sentences WHERE doc_id=?", (doc_id,))
+            removed = self._conn.execute("DELETE FROM documents WHERE id=?", (doc_id,)).rowcount
+            self._changed()
+        return bool(removed)
+
+    def documents(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT id, name, sentences, keywords, added FROM documents ORDER BY id").fetchall()
+        return [{"id": r[0], "name": r[1], "sentences": r[2], "keywords": json.loads(r[3]), "added": r[4]} for r in rows]
+
+    def _changed(self):
+        # caller holds the lock; topic analyses are keyed by this, so they go stale with any change
+        self._version = self._conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM documents").fetchone()
+
+    # ---------- Search ----------
+    def search(self, query, n=20):
+        """Sentences matching the query's terms, best first: [{doc_id, document, sentence, start, end,
+        text, score}]. Sentences with every term rank first (TF-IDF over the library's sentences);
+        when none has them all, sentences with any of them are returned."""
+        terms = list(dict.fromkeys(index_terms(query)))
+        if not terms:
+            return []
+        marks = ",".join("?" * len(terms))
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(sentences), 0) FROM documents").fetchone()[0]
+            idf = {t: math.log(1 + total / df) for t, df in self._conn.execute(
+                f"SELECT term, df FROM terms WHERE term IN ({marks})", terms)}
+            hits = self._conn.execute(
+                f"SELECT term, doc_id, idx, tf FROM postings WHERE term IN ({marks})", terms
+            ).fetchall()
+        scores = defaultdict(float)
+        matched = Counter()
+        for term, doc_id, idx, tf in hits:
+            scores[(doc_id, idx)] += (1 + math.log(tf)) * idf[term]
+            matched[(doc_id, idx)] += 1
+        best = max(matched.values(), default=0)
+        if best < len(terms):
+            best = 1
+        # ties: document order
+        ranked = sorted((k for k in scores if matched[k] >= best), key=lambda k: (-matched[k], -scores[k], k))[:n]
+        return self._sentences(ranked, scores)
+
+    def _sentences(self, keys, scores):
+        if not keys:
+            return []
+        with self._lock:
+            names = dict(self._conn.execute("SELECT id, name FROM documents"))
+            rows = {}
+            for doc_id, idx in keys:
+                rows[(doc_id, idx)] = self._conn.execute(
+                    "SELECT start, end, text FROM sentences WHERE doc_id=? AND idx=?", (doc_id, idx)
+                ).fetchone()
+        return [
+            {"doc_id": d, "document": names.get(d, ""), "sentence": i, "start": rows[(d, i)][0],
+             "end": rows[(d, i)][1], "text": rows[(d, i)][2], "score": round(scores[(d, i)], 4)}
+            for d, i in keys
+        ]
+
+    # ---------- Topics ----------
+    def topic_text(self, query, n=TOPIC_SENTENCES):
+        # the best matching sentences, back in document order, one paragraph per document
+        hits = sorted(self.search(query, n=n), key=lambda h: (h["doc_id"], h["sentence"]))
+        paragraphs = []
+        last = None
+        for h in hits:
+            if h["doc_id"] != last:
+                paragraphs.append([])
+                last = h["doc_id"]
+            paragraphs[-1].append(h["text"])
+        return "\n\n".join(" ".join(p) for p in paragraphs)
+
+    def topic(self, query, n=TOPIC_SENTENCES):
+        """analyze_text() of a topic's matching sentences across the library (cached until the library
+        changes). Every generator accepts it, e.g. generate_exam_style_mcqs(lib.topic("enzymes"))."""
+        key = (" ".join(index_terms(query)), n, self._version)
+        return self._topics.get_or_compute(key, lambda: analyze_text(self.topic_text(query, n=n)))
+
+    def stats(self):
+        with self._lock:
+            docs, sentences = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(sentences), 0) FROM documents").fetchone()
+            terms = self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+        return {"documents": docs, "sentences": sentences, "terms": terms}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,106 @@
+# Hot-path instrumentation: per-stage timings and counters
+# One Metrics object records a single run (a Streamlit rerun, a CLI document); a MetricsRegistry
+# accumulates runs process-wide and renders them as JSON log lines or Prometheus text.
+
+import json, logging, os, threading, time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+logger = logging.getLogger("study_assistant.metrics")
+
+def default_metrics_path():
+    # Prometheus textfile-collector export, opt-in: only written when STUDY_ASSISTANT_METRICS_FILE is set
+    return os.environ.get("STUDY_ASSISTANT_METRICS_FILE") or None
+
+class Metrics:
+    """Stage timings (seconds, in first-seen order) and counters for one run."""
+
+    def __init__(self):
+        self.timings = OrderedDict()
+        self.counters = Counter()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def as_dict(self):
+        return {"timings": dict(self.timings), "counters": dict(self.counters)}
+
+    def log(self, **fields):
+        # one structured (JSON) log line per run
+        logger.info(json.dumps({"event": "run_metrics", **fields, **self.as_dict()}, sort_keys=True))
+
+@contextmanager
+def maybe_stage(metrics, name):
+    # library code takes metrics=None; this keeps the uninstrumented path free of branches
+    if metrics is None:
+        yield None
+    else:
+        with metrics.stage(name):
+            yield metrics
+
+class MetricsRegistry:
+    """Thread-safe process-wide totals: stage seconds sum/count and counter totals."""
+
+    def __init__(self, prefix="study_assistant"):
+        self.prefix = prefix
+        self.runs = 0
+        self.stage_sum = Counter()
+        self.stage_count = Counter()
+        self.stage_max = {}
+        self.counters = Counter()
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+
+    def record(self, metrics):
+        with self._lock:
+            self.runs += 1
+            for name, seconds in metrics.timings.items():
+                self.stage_sum[name] += seconds
+                self.stage_count[name] += 1
+                self.stage_max[name] = max(self.stage_max.get(name, 0.0), seconds)
+            self.counters.update(metrics.counters)
+
+    def to_prometheus(self):
+        p = self.prefix
+        with self._lock:
+            lines = [
+                f"# HELP {p}_runs_total Instrumented runs (Streamlit reruns).",
+                f"# TYPE {p}_runs_total counter",
+                f"{p}_runs_total {self.runs}",
+                f"# HELP {p}_stage_seconds Wall time spent per stage.",
+                f"# TYPE {p}_stage_seconds summary",
+            ]
+            for name in sorted(self.stage_sum):
+                lines.append(f'{p}_stage_seconds_sum{{stage="{name}"}} {self.stage_sum[name]:.6f}')
+                lines.append(f'{p}_stage_seconds_count{{stage="{name}"}} {self.stage_count[name]}')
+            lines += [f"# HELP {p}_stage_seconds_max Slowest single run per stage.", f"# TYPE {p}_stage_seconds_max gauge"]
+            for name in sorted(self.stage_max):
+                lines.append(f'{p}_stage_seconds_max{{stage="{name}"}} {self.stage_max[name]:.6f}')
+            for name in sorted(self.counters):
+                lines += [f"# TYPE {p}_{name}_total counter", f"{p}_{name}_total {self.counters[name]}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, min_interval=10.0):
+        # atomic textfile-collector export, throttled so busy servers don't rewrite it on every rerun
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_write < min_interval:
+                return False
+            self._last_write = now
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+        return True
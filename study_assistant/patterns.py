@@ -0,0 +1,123 @@
+# Context pattern engine
+
+import re, textwrap
+
+from .text import split_sentences, iter_segments
+
+# All rules are compiled once. Connector rules carry no leading lazy "(.*?)" group, so each
+# search is linear in the sentence length; the text either side of the match is sliced off.
+MAX_PATTERN_SENTENCE = 600  # unpunctuated PDF text can form one giant "sentence"; cut it into windows
+
+DEFINITION_RE = re.compile(r"\s*([A-Z]?[A-Za-z0-9\-/ ]{3,})\s+(is|are|refers to|means)\s+(.*?)[\.]?$")
+CAUSE_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r"\s+(?:causes|leads to|results in|triggers)\s+",
+    r"\s+because\s+",
+    r"\s+therefore\s+",
+    r"\s+so\s+",
+)]
+CONTRAST_RE = re.compile(r";\s*however,\s*|\s+but\s+|\s+whereas\s+", re.IGNORECASE)
+EXAMPLE_RE = re.compile(r"(?:such as|for example|e\.g\.?|including)\s+", re.IGNORECASE)
+ITEM_SPLIT_RE = re.compile(r",|;| and ")
+NUMBERED_STEP_RE = re.compile(r"(\d+)[\).]\s*([A-Za-z].*)", re.DOTALL)  # matched against list-item segments
+
+def bounded_sentences(sentences):
+    for s in sentences:
+        if len(s) <= MAX_PATTERN_SENTENCE:
+            yield s
+        else:
+            yield from textwrap.wrap(s, MAX_PATTERN_SENTENCE)
+
+def classify_sentence(s):
+    """Run every pattern rule over one sentence.
+    Returns (definition, cause, contrast, examples, enumeration); missing parts are None / [].
+    """
+    definition = cause = contrast = enumeration = None
+    examples = []
+
+    m = DEFINITION_RE.match(s)
+    if m:
+        term = m.group(1).strip()
+        defin = m.group(3).strip()
+        if len(term) >= 2 and len(defin) >= 5:
+            definition = (term, defin)
+
+    # first cause rule (in priority order) with a usable left and right side wins
+    for rx in CAUSE_RES:
+        m = rx.search(s)
+        if m:
+            left = s[:m.start()].strip(' ,;:.')
+            right = s[m.end():].strip(' ,;:.')
+            if left and right and len(left) > 2 and len(right) > 2:
+                cause = (left, right)
+                break
+
+    m = CONTRAST_RE.search(s)
+    if m:
+        a = s[:m.start()].strip(' ,;:.')
+        b = s[m.end():].strip(' ,;:.')
+        if a and b:
+            contrast = (a, b)
+
+    m = EXAMPLE_RE.search(s)
+    if m:
+        topic = s[:m.start()].strip(' ,;:.')
+        if topic:
+            items = [x.strip() for x in ITEM_SPLIT_RE.split(s[m.end():]) if x.strip()]
+            examples = [(topic, it) for it in items]
+
+    # topic: item1, item2, ...
+    if ':' in s and ',' in s:
+        topic, after = s.split(':', 1)
+        items = [x.strip() for x in ITEM_SPLIT_RE.split(after) if len(x.strip()) >= 2]
+        if topic.strip() and len(items) >= 2:
+            enumeration = (topic.strip(), items[:6])
+
+    return definition, cause, contrast, examples, enumeration
+
+def extract_context_patterns(text: str, sentences=None):
+    """Lightweight extraction of study-useful patterns from raw text.
+    Returns dict: definitions, causes, contrasts, examples, enumerations, processes.
+    """
+    if isinstance(text, dict):
+        return text["patterns"]
+    if sentences is None:
+        sentences = split_sentences(text)
+    definitions = []   # (term, definition)
+    causes = []        # (cause, effect)
+    contrasts = []     # (a, b)
+    examples = []      # (topic, item)
+    enumerations = []  # (topic, [items])
+    processes = []     # (label, [steps])
+
+    # single pass: each sentence is classified against every rule
+    for s in bounded_sentences(sentences):
+        definition, cause, contrast, exs, enumeration = classify_sentence(s)
+        if definition:
+            definitions.append(definition)
+        if cause:
+            causes.append(cause)
+        if contrast:
+            contrasts.append(contrast)
+        if exs:
+            examples.extend(exs)
+        if enumeration:
+            enumerations.append(enumeration)
+
+    # Processes: numbered list items (clean_text() keeps the line breaks that mark them)
+    steps = []
+    for kind, start, end in iter_segments(text):
+        if kind == "item":
+            m = NUMBERED_STEP_RE.match(text, start, end)
+            if m:
+                steps.append(" ".join(m.group(2).split()))
+    if steps:
+        processes.append(("Steps", steps[:6]))
+
+    return {
+        "definitions": definitions,
+        "causes": causes,
+        "contrasts": contrasts,
+        "examples": examples,
+        "enumerations": enumerations,
+        "processes": processes,
+    }
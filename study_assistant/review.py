@@ -0,0 +1,266 @@
+# Spaced repetition for flashcards: SM-2 scheduling, a due-card heap and per-user persistence (SQLite)
+# A user's deck holds every card they have written, across documents, keyed by the card's id. The next due
+# card is the head of a min-heap on due time; reviews push a new entry and outdated ones are skipped when
+# they reach the top.
+
+import heapq, itertools, os, sqlite3, threading, time
+
+from .store import data_dir
+from .compact import PLACEHOLDER_DEFINITION
+
+DAY = 86400.0
+SM2_START_EASE = 2.5
+SM2_MIN_EASE = 1.3
+RELEARN_SECONDS = 60.0   # a failed card comes back in the same session instead of tomorrow
+GRADES = {"Again": 1, "Hard": 3, "Good": 4, "Easy": 5}   # SM-2 quality 0-5; below 3 is a lapse
+
+def default_review_path():
+    return os.path.join(data_dir(), "reviews.sqlite3")
+
+def card_key(term):
+    # key of a card added by term alone; app cards use their Flashcard id
+    return " ".join(term.lower().split())
+
+def sm2(ease, interval, reps, grade):
+    """One SM-2 step: (ease, interval in days, repetitions) after a review graded 0-5."""
+    if grade < 3:
+        reps, interval = 0, 0.0
+    else:
+        interval = 1.0 if reps == 0 else 6.0 if reps == 1 else round(interval * ease, 1)
+        reps += 1
+    ease = max(SM2_MIN_EASE, ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    return ease, interval, reps
+
+class ReviewCard:
+    __slots__ = ("key", "term", "definition", "ease", "interval", "reps", "lapses", "due", "last")
+
+    def __init__(self, term, definition, ease=SM2_START_EASE, interval=0.0, reps=0, lapses=0, due=0.0, last=None, key=None):
+        self.key = key or card_key(term)
+        self.term = term
+        self.definition = definition
+        self.ease = ease
+        self.interval = interval
+        self.reps = reps
+        self.lapses = lapses
+        self.due = due
+        self.last = last
+
+    def as_row(self):
+        return (self.key, self.term, self.definition, self.ease, self.interval, self.reps, self.lapses, self.due, self.last)
+
+def _apply_review(card, grade, now):
+    if grade < 3 and card.reps:
+        card.lapses += 1
+    card.ease, card.interval, card.reps = sm2(card.ease, card.interval, card.reps, grade)
+    card.due = now + (card.interval * DAY if card.interval else RELEARN_SECONDS)
+    card.last = now
+
+class ReviewStore:
+    """Review state per (user, card) in SQLite; one row is written per review. Every write bumps the
+    user's revision, so decks held by other sessions in this process know to reload."""
+
+    def __init__(self, path=None):
+        self.path = path or default_review_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS reviews ("
+                " user TEXT NOT NULL, key TEXT NOT NULL, term TEXT NOT NULL, definition TEXT NOT NULL,"
+                " ease REAL NOT NULL, interval REAL NOT NULL, reps INTEGER NOT NULL, lapses INTEGER NOT NULL,"
+                " due REAL NOT NULL, last REAL, PRIMARY KEY (user, key)) WITHOUT ROWID"
+            )
+            # untouched placeholder cards were once synced into decks; they are not the student's cards
+            self._conn.execute("DELETE FROM reviews WHERE definition=?", (PLACEHOLDER_DEFINITION,))
+        self._revisions = {}
+
+    def revision(self, user):
+        with self._lock:
+            return self._revisions.get(user, 0)
+
+    def _bump(self, user):
+        # caller holds the lock
+        self._revisions[user] = self._revisions.get(user, 0) + 1
+        return self._revisions[user]
+
+    def load(self, user):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT term, definition, ease, interval, reps, lapses, due, last, key FROM reviews WHERE user=?", (user,)
+            ).fetchall()
+        return [ReviewCard(*r) for r in rows]
+
+    def save(self, user, cards):
+        """Insert or replace cards; returns the user's new revision."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", [(user,) + c.as_row() for c in cards]
+            )
+            return self._bump(user)
+
+    def update(self, user, key, change):
+        """Read a card, change(card) and write it back in one write transaction, so concurrent reviews of a
+        card (other sessions or processes) build on each other instead of the last write winning.
+        Returns (card, revision), or (None, revision) when the card is not stored."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT term, definition, ease, interval, reps, lapses, due, last, key FROM reviews WHERE user=? AND key=?",
+                (user, key),
+            ).fetchone()
+            if row is None:
+                return None, self._revisions.get(user, 0)
+            card = ReviewCard(*row)
+            change(card)
+            self._conn.execute("INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (user,) + card.as_row())
+            return card, self._bump(user)
+
+    def delete(self, user, keys):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM reviews WHERE user=? AND key=?", [(user, k) for k in keys])
+            return self._bump(user)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class Deck:
+    """One user's cards with SM-2 state. next_due() is O(log n) amortized: the heap top is the earliest
+    due card once outdated entries (left by reviews) are popped."""
+
+    def __init__(self, user, store=None):
+        self.user = user
+        self.store = store
+        self._seq = itertools.count()
+        self._load()
+
+    def _load(self):
+        self.revision = self.store.revision(self.user) if self.store else 0
+        self.cards = {}          # key -> ReviewCard
+        self._heap = []          # (due, seq, key)
+        for card in (self.store.load(self.user) if self.store else []):
+            self.cards[card.key] = card
+            self._heap.append((card.due, next(self._seq), card.key))
+        heapq.heapify(self._heap)
+
+    def refresh(self):
+        # another session of this user changed the deck (same process): reload it from the store
+        if self.store is not None and self.store.revision(self.user) != self.revision:
+            self._load()
+
+    def _seen(self, revision):
+        # our own write; any other write since the last load leaves the deck stale for refresh()
+        if revision == self.revision + 1:
+            self.revision = revision
+
+    def __len__(self):
+        return len(self.cards)
+
+    def _push(self, card):
+        heapq.heappush(self._heap, (card.due, next(self._seq), card.key))
+        if len(self._heap) > 2 * len(self.cards) + 64:
+            # mostly outdated entries: rebuild from the live cards
+            self._heap = [(c.due, next(self._seq), c.key) for c in self.cards.values()]
+            heapq.heapify(self._heap)
+
+    def _head(self):
+        while self._heap:
+            due, _, key = self._heap[0]
+            card = self.cards.get(key)
+            if card is not None and card.due == due:
+                return card
+            heapq.heappop(self._heap)
+        return None
+
+    def add(self, term, definition, now=None, key=None):
+        """Add a card (due now) or update an existing card's text; scheduling is kept. Returns the card.
+        key: a stable id (e.g. Flashcard.id), so renaming the card keeps its history; default: the term."""
+        card, changed = self._add(term, definition, now, key)
+        if changed:
+            self._save([card])
+        return card
+
+    def _add(self, term, definition, now, key=None):
+        key = key or card_key(term)
+        card = self.cards.get(key)
+        if card is not None:
+            if (card.term, card.definition) == (term, definition):
+                return card, False
+            card.term, card.definition = term, definition
+            return card, True
+        card = ReviewCard(term, definition, due=time.time() if now is None else now, key=key)
+        self.cards[key] = card
+        self._push(card)
+        return card, True
+
+    def sync(self, flashcards, now=None):
+        # cards from the flashcards tab (Flashcard records) the student has written, keyed by id; new or
+        # edited ones are written in one batch
+        changed = [
+            card for card, new in (self._add(c.term, c.definition, now, c.id) for c in flashcards if c.term.strip() and c.written)
+            if new
+        ]
+        if changed:
+            self._save(changed)
+
+    def remove(self, keys):
+        # deleted cards leave the deck; their heap entries are skipped when they reach the top
+        keys = [k for k in keys if self.cards.pop(k, None) is not None]
+        if keys and self.store is not None:
+            self._seen(self.store.delete(self.user, keys))
+
+    def next_due(self, now=None):
+        card = self._head()
+        now = time.time() if now is None else now
+        return card if card is not None and card.due <= now else None
+
+    def next_time(self):
+        # when the earliest card is due (None for an empty deck)
+        card = self._head()
+        return card.due if card is not None else None
+
+    def due(self, n, now=None):
+        """Up to n due cards, earliest first (O(n log N))."""
+        now = time.time() if now is None else now
+        out = []
+        while len(out) < n:
+            card = self._head()
+            if card is None or card.due > now:
+                break
+            out.append(heapq.heappop(self._heap))
+        for entry in out:
+            heapq.heappush(self._heap, entry)
+        return [self.cards[key] for _, _, key in out]
+
+    def due_count(self, now=None, cap=None):
+        """Number of due cards, counted from the heap: O(cap log n) with a cap, so a render with a large
+        deck does not scan every card."""
+        if cap is None:
+            now = time.time() if now is None else now
+            return sum(1 for c in self.cards.values() if c.due <= now)
+        return len(self.due(cap, now))
+
+    def review(self, key, grade, now=None):
+        """Record a review graded 0-5 and reschedule the card; returns it, or None when the card was
+        deleted in another session. With a store, SM-2 is applied to the stored state, not this
+        session's copy, so reviews from two sessions of one user both count."""
+        now = time.time() if now is None else now
+        if self.store is None:
+            card = self.cards[key]
+            _apply_review(card, grade, now)
+        else:
+            card, revision = self.store.update(self.user, key, lambda c: _apply_review(c, grade, now))
+            if card is None:
+                self.cards.pop(key, None)
+                return None
+            self.cards[key] = card
+            self._seen(revision)
+        self._push(card)
+        return card
+
+    def _save(self, cards):
+        if self.store is not None:
+            self._seen(self.store.save(self.user, cards))
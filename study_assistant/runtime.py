@@ -0,0 +1,70 @@
+# Process-wide shared objects for the app, plus cold-start timings
+# Streamlit re-executes the app script on every rerun, including each @st.cache_resource definition (whose
+# source is re-read and hashed every time). Defined here, they run once per process; each object is built
+# on first use and then shared by every session.
+
+import threading
+
+from .cache import LRUCache, RESULT_CACHE_SIZE, RESULT_CACHE_BYTES, CHUNK_CACHE_SIZE, CHUNK_CACHE_BYTES
+from .store import ArtifactStore
+from .metrics import MetricsRegistry
+from .jobs import JobQueue
+from .library import Library
+from .review import ReviewStore
+from .events import EventLog
+
+_shared = {}
+_startup = {}
+_lock = threading.Lock()
+
+def shared(name, factory):
+    with _lock:
+        if name not in _shared:
+            _shared[name] = factory()
+        return _shared[name]
+
+def get_result_cache():
+    return shared("result_cache", lambda: LRUCache(maxsize=RESULT_CACHE_SIZE, maxbytes=RESULT_CACHE_BYTES))
+
+def get_chunk_cache():
+    # per-chunk analyses: an edited version of the notes only re-analyzes the chunks that changed
+    return shared("chunk_cache", lambda: LRUCache(maxsize=CHUNK_CACHE_SIZE, maxbytes=CHUNK_CACHE_BYTES))
+
+def get_artifact_store():
+    # on-disk layer below the in-memory cache: survives restarts, shared by all server processes
+    return shared("artifact_store", ArtifactStore)
+
+def get_library():
+    # inverted index over every document added from any session (see study_assistant.library)
+    return shared("library", Library)
+
+def get_review_store():
+    return shared("review_store", ReviewStore)
+
+def get_event_log():
+    # quiz answers and flashcard reviews from every session, written in batches by a background thread
+    return shared("event_log", EventLog)
+
+def get_metrics_registry():
+    return shared("metrics_registry", MetricsRegistry)
+
+def get_job_queue():
+    return shared("job_queue", JobQueue)
+
+def result_key(fn, doc_hash, args, kwargs):
+    # key = generator + content hash + arguments; results are shared, treat them as read-only
+    return (fn.__name__, doc_hash, args, tuple(sorted(kwargs.items())))
+
+# ---------- Startup timings ----------
+def record_startup(stage, seconds):
+    """Keep the first (cold) timing of a startup stage ("import", "first_render"); returns False
+    for the warm reruns that follow."""
+    with _lock:
+        if stage in _startup:
+            return False
+        _startup[stage] = seconds
+        return True
+
+def startup_timings():
+    with _lock:
+        return dict(_startup)
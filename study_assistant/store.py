@@ -0,0 +1,112 @@
+# Persistent artifact store (SQLite)
+# Generated summaries / questions / MCQs / flashcards survive server restarts and are shared by every
+# session and process, so the same notes give every student the same quiz.
+
+import json, os, sqlite3, threading, time
+
+GENERATOR_VERSION = "8"               # bump whenever generator output changes; older artifacts are ignored
+STORE_MAX_BYTES = 256 * 1024 * 1024   # payload budget before least-recently-used artifacts are evicted
+
+def data_dir():
+    # STUDY_ASSISTANT_HOME overrides the default per-user directory
+    return os.environ.get("STUDY_ASSISTANT_HOME") or os.path.join(os.path.expanduser("~"), ".study_assistant")
+
+def default_store_path():
+    return os.path.join(data_dir(), "artifacts.sqlite3")
+
+def artifact_kind(fn, args=(), kwargs=None):
+    # e.g. generate_exam_style_mcqs[{"min_q": 5}] — the generator plus the arguments that shape its output
+    params = list(args) + ([dict(sorted(kwargs.items()))] if kwargs else [])
+    return fn.__name__ + (json.dumps(params, sort_keys=True) if params else "")
+
+class ArtifactStore:
+    """Artifacts keyed by (normalized-content hash, generator version, kind), stored as JSON."""
+
+    def __init__(self, path=None, max_bytes=STORE_MAX_BYTES, version=GENERATOR_VERSION):
+        self.path = path or default_store_path()
+        self.max_bytes = max_bytes
+        self.version = version
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                " content_hash TEXT NOT NULL, version TEXT NOT NULL, kind TEXT NOT NULL,"
+                " payload TEXT NOT NULL, size INTEGER NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL,"
+                " PRIMARY KEY (content_hash, version, kind))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS artifacts_last_used ON artifacts (last_used)")
+            self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+
+    def get(self, content_hash, kind, default=None):
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT payload FROM artifacts WHERE content_hash=? AND version=? AND kind=?",
+                (content_hash, self.version, kind),
+            ).fetchone()
+            if row is None:
+                return default
+            self._conn.execute(
+                "UPDATE artifacts SET last_used=? WHERE content_hash=? AND version=? AND kind=?",
+                (time.time(), content_hash, self.version, kind),
+            )
+        return json.loads(row[0])
+
+    def put(self, content_hash, kind, value):
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))   # stored bytes, not characters
+        now = time.time()
+        with self._lock, self._conn:
+            old = self._conn.execute(
+                "SELECT size FROM artifacts WHERE content_hash=? AND version=? AND kind=?",
+                (content_hash, self.version, kind),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (content_hash, self.version, kind, payload, size, now, now),
+            )
+            self._bytes += size - (old[0] if old else 0)   # a replaced artifact no longer counts
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def get_or_create(self, content_hash, kind, compute):
+        missing = object()
+        value = self.get(content_hash, kind, missing)
+        if value is missing:
+            value = compute()
+            self.put(content_hash, kind, value)
+            # hand back the JSON round-trip so fresh and stored results look the same (tuples -> lists)
+            value = json.loads(json.dumps(value))
+        return value
+
+    def _evict(self):
+        # drop stale generator versions, then least-recently-used artifacts until 90% of the budget
+        self._conn.execute("DELETE FROM artifacts WHERE version != ?", (self.version,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        if total > target:
+            rows = self._conn.execute("SELECT rowid, size FROM artifacts ORDER BY last_used").fetchall()
+            doomed = []
+            for rowid, size in rows:
+                if total <= target:
+                    break
+                doomed.append((rowid,))
+                total -= size
+            self._conn.executemany("DELETE FROM artifacts WHERE rowid=?", doomed)
+        self._bytes = total
+
+    def stats(self):
+        with self._lock:
+            count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM artifacts").fetchone()
+        return {"artifacts": count, "bytes": size, "max_bytes": self.max_bytes, "version": self.version}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def stored_call(store, fn, doc, *args, **kwargs):
+    # fn(doc, *args, **kwargs), persisted under the document's content hash
+    return store.get_or_create(doc["hash"], artifact_kind(fn, args, kwargs), lambda: fn(doc, *args, **kwargs))
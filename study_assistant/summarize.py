@@ -0,0 +1,154 @@
+# Extractive summarization: TextRank over a sparse sentence-term TF-IDF matrix
+# The matrix is kept in coordinate form (row, column, weight) and every product is a sparse
+# matrix-vector product, so one ranking pass costs O(non-zeros) instead of O(sentences^2).
+
+import importlib.util, math
+
+from .text import WORD_RE
+from .tfidf import load_background
+
+# Optional NumPy: sparse products run as vectorized bincounts when it is available
+# (located at import, imported with the first vectorized call: importing the package stays cheap)
+_NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+SUMMARY_WORDS = 120               # default length budget (words)
+SUMMARY_MAX_SENTENCES = 6
+SUMMARY_MIN_WORDS = 5             # stop filling the budget when fewer words than this are left
+EXACT_MAX_SENTENCES = 5000        # beyond this, "auto" mode switches to the approximate centroid ranking
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_ITERATIONS = 30
+TEXTRANK_TOLERANCE = 1e-6
+REDUNDANCY_OVERLAP = 0.6          # skip a sentence sharing this much of its vocabulary with one already chosen
+
+# ---------- Sentence-term matrix ----------
+def sentence_term_matrix(sentences, exclude=(), background=None):
+    """COO triples (rows, cols, weights) of L2-normalized TF-IDF sentence vectors, plus the term count."""
+    n_docs, df = background or load_background()
+    vocab = {}; idf = []
+    rows = []; cols = []; vals = []
+    for i, s in enumerate(sentences):
+        counts = {}
+        for w in WORD_RE.findall(s):
+            w = w.lower()
+            if w not in exclude:
+                counts[w] = counts.get(w, 0) + 1
+        if not counts:
+            continue
+        weights = []
+        for w, c in counts.items():
+            j = vocab.get(w)
+            if j is None:
+                j = vocab[w] = len(idf)
+                idf.append(math.log((n_docs + 1.0) / (df.get(w, 0) + 1.0)) + 1.0)
+            cols.append(j)
+            weights.append((1.0 + math.log(c)) * idf[j])
+        norm = math.sqrt(sum(x * x for x in weights))
+        rows.extend([i] * len(weights))
+        vals.extend(x / norm for x in weights)
+    if _NUMPY_AVAILABLE:
+        import numpy as np
+        return np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64), np.asarray(vals), len(vocab)
+    return rows, cols, vals, len(vocab)
+
+def _xt_dot(matrix, r):
+    # X^T r: sentence weights -> term weights
+    rows, cols, vals, n_terms = matrix
+    if _NUMPY_AVAILABLE:
+        import numpy as np
+        return np.bincount(cols, weights=vals * r[rows], minlength=n_terms)
+    out = [0.0] * n_terms
+    for i, j, v in zip(rows, cols, vals):
+        out[j] += v * r[i]
+    return out
+
+def _x_dot(matrix, u, n):
+    # X u: term weights -> sentence weights
+    rows, cols, vals, _ = matrix
+    if _NUMPY_AVAILABLE:
+        import numpy as np
+        return np.bincount(rows, weights=vals * u[cols], minlength=n)
+    out = [0.0] * n
+    for i, j, v in zip(rows, cols, vals):
+        out[i] += v * u[j]
+    return out
+
+# ---------- Rankers ----------
+def textrank_scores(matrix, n):
+    """PageRank over the cosine-similarity graph S = X X^T without self loops, never materializing S."""
+    rows = matrix[0]
+    if _NUMPY_AVAILABLE:
+        import numpy as np
+        self_sim = np.bincount(rows, minlength=n).astype(bool).astype(np.float64)  # 1 for non-empty rows
+        degree = _x_dot(matrix, _xt_dot(matrix, np.ones(n)), n) - self_sim
+        degree[degree <= 1e-12] = np.inf   # isolated sentences pass nothing on
+        r = np.full(n, 1.0 / n)
+        for _ in range(TEXTRANK_ITERATIONS):
+            u = r / degree
+            new = (1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (_x_dot(matrix, _xt_dot(matrix, u), n) - self_sim * u)
+            done = np.abs(new - r).sum() < TEXTRANK_TOLERANCE
+            r = new
+            if done:
+                break
+        return r
+    self_sim = [0.0] * n
+    for i in rows:
+        self_sim[i] = 1.0
+    sums = _x_dot(matrix, _xt_dot(matrix, [1.0] * n), n)
+    degree = [d - s if d - s > 1e-12 else math.inf for d, s in zip(sums, self_sim)]
+    r = [1.0 / n] * n
+    for _ in range(TEXTRANK_ITERATIONS):
+        u = [x / d for x, d in zip(r, degree)]
+        flow = _x_dot(matrix, _xt_dot(matrix, u), n)
+        new = [(1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (f - s * x) for f, s, x in zip(flow, self_sim, u)]
+        done = sum(abs(a - b) for a, b in zip(new, r)) < TEXTRANK_TOLERANCE
+        r = new
+        if done:
+            break
+    return r
+
+def centroid_scores(matrix, n):
+    """Approximate mode: cosine-like similarity of each sentence to the document centroid (one pass)."""
+    if _NUMPY_AVAILABLE:
+        import numpy as np
+        return _x_dot(matrix, _xt_dot(matrix, np.ones(n)), n)
+    return _x_dot(matrix, _xt_dot(matrix, [1.0] * n), n)
+
+def rank_sentences(sentences, mode="auto", exclude=(), background=None, kinds=None):
+    """Sentence indices, most central first. mode: "textrank", "centroid" or "auto"
+    (TextRank up to EXACT_MAX_SENTENCES sentences, centroid beyond). Ties keep document order.
+    kinds: split_sentences() segment kinds; headings and list items then rank after running text."""
+    n = len(sentences)
+    if not n:
+        return []
+    if mode == "auto":
+        mode = "textrank" if n <= EXACT_MAX_SENTENCES else "centroid"
+    matrix = sentence_term_matrix(sentences, exclude, background)
+    scores = textrank_scores(matrix, n) if mode == "textrank" else centroid_scores(matrix, n)
+    demoted = [k != "paragraph" for k in kinds] if kinds else [False] * n
+    if _NUMPY_AVAILABLE:
+        import numpy as np
+        return np.lexsort((-scores, np.asarray(demoted))).tolist()  # stable: ties keep document order
+    return sorted(range(n), key=lambda i: (demoted[i], -scores[i], i))
+
+# ---------- Length-budgeted selection ----------
+def select_summary(sentences, order, max_words=SUMMARY_WORDS, max_sentences=SUMMARY_MAX_SENTENCES, kinds=None):
+    """Best-ranked sentences that fit the word budget, near-duplicates skipped, in document order.
+    With kinds, only running text ("paragraph") is used, unless the notes have none (e.g. only a list)."""
+    if kinds:
+        order = [i for i in order if kinds[i] == "paragraph"] or order
+    chosen = []; seen = []; words = 0
+    for i in order:
+        if len(chosen) >= max_sentences or max_words - words < SUMMARY_MIN_WORDS:
+            break
+        n_words = len(sentences[i].split())
+        if words + n_words > max_words:
+            continue
+        vocab = {w.lower() for w in WORD_RE.findall(sentences[i])}
+        if any(vocab and len(vocab & v) >= REDUNDANCY_OVERLAP * len(vocab) for v in seen):
+            continue
+        chosen.append(i); seen.append(vocab); words += n_words
+    if not chosen and order:
+        # nothing fits (e.g. unpunctuated notes): truncate the best sentence to the budget
+        head = sentences[order[0]].split()
+        return [" ".join(head[:max_words]) + (" …" if len(head) > max_words else "")]
+    return [sentences[i] for i in sorted(chosen)]
@@ -0,0 +1,54 @@
+# Question / distractor templates (many, domain-aware)
+
+GENERIC_TEMPLATES = [
+    "Summarize the role of '{k}' in the context of this passage.",
+    "Why is '{k}' considered important in this topic?",
+    "Provide a practical example that demonstrates '{k}'.",
+    "What challenges are associated with '{k}' and how can they be mitigated?",
+    "How does '{k}' relate to other major concepts mentioned here?",
+    "Propose one recommendation to improve outcomes related to '{k}'.",
+    "Explain how '{k}' has evolved historically and its current relevance."
+]
+
+CODING_TEMPLATES = [
+    "Explain how the concept '{k}' affects software design or performance.",
+    "Write a short example (in words) showing '{k}' in code or algorithmic context.",
+    "What trade-offs are involved when using '{k}' in system implementation?",
+    "How would you debug or test issues related to '{k}'?",
+    "Compare '{k}' with a related programming concept and state the key difference.",
+    "Describe a real-world application where '{k}' improves system behavior."
+]
+
+MEDICAL_TEMPLATES = [
+    "Define '{k}' clinically and describe its diagnostic significance.",
+    "Describe one treatment or management strategy related to '{k}'.",
+    "What are common complications or concerns associated with '{k}'?",
+    "How would you explain the importance of '{k}' to a patient in simple terms?",
+    "Compare '{k}' with a related medical concept and outline differences.",
+    "Suggest a basic diagnostic approach or test for '{k}'."
+]
+
+SCIENCE_TEMPLATES = [
+    "Explain the underlying principle of '{k}' and its significance in this field.",
+    "Describe an experiment or observation that demonstrates '{k}'.",
+    "What are the main factors that influence '{k}' in this context?",
+    "How does '{k}' interact with other scientific concepts discussed here?",
+    "Outline practical applications of '{k}' in technology or research."
+]
+
+# MCQ distractor templates
+DISTRACTOR_PATTERNS = [
+    "{} is mainly an example or case, not the core concept.",
+    "{} commonly refers to a method rather than the concept itself.",
+    "{} often denotes an effect or result, not the definition.",
+    "{} is a related concept but not correct in this context."
+]
+
+def create_question_templates(domain):
+    if domain == "coding":
+        return CODING_TEMPLATES + GENERIC_TEMPLATES
+    if domain == "medical":
+        return MEDICAL_TEMPLATES + GENERIC_TEMPLATES
+    if domain == "science":
+        return SCIENCE_TEMPLATES + GENERIC_TEMPLATES
+    return GENERIC_TEMPLATES
@@ -0,0 +1,141 @@
+# Text normalization, structure segments and sentence splitting
+# Normalized text keeps its structure: line breaks, paragraph breaks ("\n\n") and page breaks ("\f", as
+# joined by the ingest readers). iter_segments() exposes that structure as a stream of spans.
+
+import re, hashlib
+
+# ---------- Normalization ----------
+def clean_text(t):
+    """One pass over the lines: whitespace runs inside a line become one space, runs of blank lines
+    become one paragraph break, and line and page breaks are kept. No regex; every step is a C-level
+    str split/join."""
+    if not t:
+        return ""
+    pages = []
+    for page in t.split("\f"):
+        lines = []
+        blank = False
+        for line in page.splitlines():
+            line = " ".join(line.split())
+            if not line:
+                blank = True
+                continue
+            if blank and lines:
+                lines.append("")  # paragraph break
+            lines.append(line)
+            blank = False
+        if lines:
+            pages.append("\n".join(lines))
+    return "\f".join(pages)
+
+# ---------- Segments ----------
+LIST_MARKER = r'(?:\d+[.)]|[-*•])\s'
+LIST_ITEM_RE = re.compile(LIST_MARKER)
+BLOCK_BREAK_RE = re.compile(r'\n\n|\f|\n(?=' + LIST_MARKER + ')')   # paragraph, page, next list item
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+SENTENCE_PUNCT_RE = re.compile(r'[.!?](?:\s|$)')
+HEADING_MAX_CHARS = 60
+HEADING_TAIL_WORDS = {"a", "an", "and", "are", "as", "at", "by", "for", "in", "is", "of", "on", "or", "the", "to", "with"}
+
+def is_heading(line):
+    # short, capitalized, no sentence punctuation, and not cut off mid-phrase ("... in the")
+    if not line or len(line) > HEADING_MAX_CHARS or line[-1] in ",;:" or not (line[0].isupper() or line[0].isdigit()):
+        return False
+    if SENTENCE_PUNCT_RE.search(line):
+        return False
+    return line.rsplit(" ", 1)[-1].lower() not in HEADING_TAIL_WORDS
+
+def _block_segments(t, start, end):
+    if start >= end:
+        return
+    if LIST_ITEM_RE.match(t, start):
+        # an item runs on over soft-wrapped lines (lowercase starts); any other line starts a new block
+        nl = t.find("\n", start, end)
+        while nl != -1 and t[nl + 1:nl + 2].islower():
+            nl = t.find("\n", nl + 1, end)
+        if nl == -1:
+            yield ("item", start, end)
+            return
+        yield ("item", start, nl)
+        start = nl + 1
+    if t.find("\n", start, end) == -1:
+        # a block of its own: a title line ("Cell Biology: Energy and Metabolism") or one line of prose
+        yield ("heading" if is_heading(t[start:end]) else "paragraph", start, end)
+        return
+    # a line is a heading when it passes is_heading(), starts the block or follows a finished sentence,
+    # and the next line starts a new sentence (capital letter or digit)
+    lines = t[start:end].split("\n")
+    seg_start = line_start = start
+    for i, line in enumerate(lines):
+        if ((i == 0 or lines[i - 1][-1:] in ".!?:") and is_heading(line)
+                and (i == len(lines) - 1 or lines[i + 1][:1].isupper() or lines[i + 1][:1].isdigit())):
+            if line_start > seg_start:
+                yield ("paragraph", seg_start, line_start - 1)
+            yield ("heading", line_start, line_start + len(line))
+            seg_start = line_start + len(line) + 1
+        line_start += len(line) + 1
+    if seg_start < end:
+        yield ("paragraph", seg_start, end)
+
+def iter_segments(t):
+    """Structure of normalized text as (kind, start, end) spans in document order: "heading", "item"
+    (one list entry), "paragraph" (running text between them) and zero-width "page" markers."""
+    pos = 0
+    for m in BLOCK_BREAK_RE.finditer(t):
+        yield from _block_segments(t, pos, m.start())
+        if m.group() == "\f":
+            yield ("page", m.start(), m.start())
+        pos = m.end()
+    yield from _block_segments(t, pos, len(t))
+
+# ---------- Sentences ----------
+def split_sentences(t, kinds=False):
+    """Sentences without line breaks. Headings and list items stand alone; soft-wrapped lines are
+    joined, and a sentence left unfinished at a page break continues on the next page.
+    kinds=True returns (sentences, kinds) with each sentence's segment kind: "heading", "item" or
+    "paragraph" (running text, the only kind a prose summary is built from)."""
+    pairs = _sentence_pairs(t)
+    sentences = [s for _, s in pairs]
+    return (sentences, [k for k, _ in pairs]) if kinds else sentences
+
+def _sentence_pairs(t):
+    if not t:
+        return []
+    if "\n" not in t and "\f" not in t and not LIST_ITEM_RE.match(t):
+        return [("paragraph", seg.strip()) for seg in SENTENCE_SPLIT_RE.split(t) if seg.strip()]
+    out = []   # (kind, sentence)
+    carry = ""
+    last_kind = None
+    for kind, start, end in iter_segments(t):
+        if kind == "page":
+            if last_kind == "paragraph" and out and out[-1][1][-1] not in ".!?":
+                carry = out.pop()[1]
+            continue
+        block = t[start:end].replace("\n", " ")
+        if carry:
+            if kind == "paragraph":
+                block = carry + " " + block
+            else:
+                out.append(("paragraph", carry))
+            carry = ""
+        if kind == "heading":
+            out.append((kind, block))
+        elif kind == "item":
+            # split after the marker only, so "1. Prophase ..." keeps its number instead of yielding "1."
+            m = LIST_ITEM_RE.match(block)
+            marker = m.end() if m else 0   # a bare "1." line has no text after the marker
+            parts = [seg.strip() for seg in SENTENCE_SPLIT_RE.split(block[marker:]) if seg.strip()] or [""]
+            parts[0] = (block[:marker] + parts[0]).strip()
+            out.extend((kind, seg) for seg in parts)
+        else:
+            out.extend((kind, seg.strip()) for seg in SENTENCE_SPLIT_RE.split(block) if seg.strip())
+        last_kind = kind
+    if carry:
+        out.append(("paragraph", carry))
+    return out
+
+# 4+ letter alpha/compound tokens (keywords, frequencies)
+WORD_RE = re.compile(r'\b[A-Za-z][A-Za-z0-9\-/+]{3,}\b')
+
+def content_hash(text):
+    return hashlib.sha256((text or "").encode("utf-8", errors="ignore")).hexdigest()
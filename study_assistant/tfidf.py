@@ -0,0 +1,54 @@
+# TF-IDF keyword ranking against a background document-frequency table
+# The table (resources/background_df.json) ships with the package and can be rebuilt from a course's own
+# notes with tools/build_background_df.py. Words missing from it are treated as rare (maximum idf).
+
+import importlib.util, json, math, os, threading
+
+# Optional NumPy: all candidates are scored in one vectorized step when it is available
+# (located at import, imported with the first vectorized call: importing the package stays cheap)
+_NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+BACKGROUND_DF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "background_df.json")
+
+_background = None
+_background_lock = threading.Lock()
+
+def load_background(path=None):
+    """(documents, {term: document frequency}); the default table is loaded once per process."""
+    global _background
+    if path:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data["documents"], data["df"]
+    with _background_lock:
+        if _background is None:
+            try:
+                _background = load_background(BACKGROUND_DF_PATH)
+            except (OSError, ValueError, KeyError):
+                _background = (1, {})  # no table: idf is flat and ranking falls back to term frequency
+        return _background
+
+def tfidf_scores(terms, counts, background=None):
+    """(1 + ln tf) * (ln((N + 1) / (df + 1)) + 1) for lowercase terms and their in-document counts."""
+    n_docs, df = background or load_background()
+    if _NUMPY_AVAILABLE:
+        import numpy as np
+        tf = np.asarray(counts, dtype=np.float64)
+        dfs = np.fromiter((df.get(t, 0) for t in terms), dtype=np.float64, count=len(terms))
+        return (1.0 + np.log(tf)) * (np.log((n_docs + 1.0) / (dfs + 1.0)) + 1.0)
+    return [(1.0 + math.log(c)) * (math.log((n_docs + 1.0) / (df.get(t, 0) + 1.0)) + 1.0) for t, c in zip(terms, counts)]
+
+def rank_by_tfidf(freq, exclude=(), n=None, background=None):
+    """Lowercase terms of freq (a Counter) best first; ties keep first-seen order."""
+    terms = [w for w in freq if w not in exclude]
+    if not terms:
+        return []
+    scores = tfidf_scores(terms, [freq[w] for w in terms], background)
+    if _NUMPY_AVAILABLE:
+        import numpy as np
+        order = np.argsort(-scores, kind="stable")
+        if n is not None:
+            order = order[:n]
+        return [terms[i] for i in order]
+    order = sorted(range(len(terms)), key=lambda i: -scores[i])
+    return [terms[i] for i in order[:n]]
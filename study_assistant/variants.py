@@ -0,0 +1,36 @@
+# Quiz variants: many reproducible exam versions from a single analysis
+#
+#   doc = analyze_text(clean_text(notes))
+#   with open("exam.jsonl", "w", encoding="utf-8") as f:
+#       write_jsonl(generate_quiz_variants(doc, 40, seed="midterm"), f)
+
+import json, random
+
+from .analysis import ensure_analysis
+from .generators import generate_exam_style_mcqs
+
+VARIANT_QUESTIONS = 10   # questions per variant
+VARIANT_POOL = 2         # each variant draws its questions from a pool this many times larger
+
+def variant_rng(seed, index):
+    # string seeds are hashed deterministically, so variant i is the same on every machine and run
+    return random.Random(f"{seed}:{index}")
+
+def generate_quiz_variants(text, n, seed=0, questions=VARIANT_QUESTIONS, pool=VARIANT_POOL):
+    """Yield n quiz variants {"variant", "seed", "mcqs"} built from one analysis of text (or an
+    analyze_text() result). Each variant has its own question subset (kept in pool order),
+    distractors and option order, all derived from (seed, variant index)."""
+    doc = ensure_analysis(text)
+    for i in range(n):
+        rng = variant_rng(seed, i)
+        candidates = generate_exam_style_mcqs(doc, min_q=questions * pool, rng=rng)
+        picked = sorted(rng.sample(range(len(candidates)), min(questions, len(candidates))))
+        yield {"variant": i + 1, "seed": str(seed), "mcqs": [candidates[j] for j in picked]}
+
+def write_jsonl(records, f):
+    """Write each record as one JSON line as soon as it is produced; returns the number written."""
+    count = 0
+    for record in records:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
@@ -0,0 +1,107 @@
+# Build the background document-frequency table used for TF-IDF keyword ranking.
+#
+#   python tools/build_background_df.py --wordfreq en                       # the shipped table (pip install wordfreq)
+#   python tools/build_background_df.py --wordfreq en --corpus ~/course_notes
+#
+# --corpus counts real document frequencies (each blank-line separated paragraph of every .txt file is a
+# document). --wordfreq derives them from wordfreq's word frequencies (Wikipedia, news, books, subtitles and
+# web text): a word with frequency f occurs in a fraction 1 - exp(-f * L) of L-token documents (Poisson).
+# --ranked estimates them from a frequency-ranked word list with a Zipf curve. Later sources win for the
+# words they cover, in the order ranked, wordfreq, corpus; corpus counts are rescaled to --documents.
+#
+# Attribution: a table built with --wordfreq (including the shipped one) is derived from the wordfreq data
+# by Robyn Speer (https://github.com/rspeer/wordfreq), licensed CC BY-SA 4.0
+# (https://creativecommons.org/licenses/by-sa/4.0/); the table is shared under the same licence. The
+# notice is also written into the table's "attribution" and "license" fields.
+
+import argparse, json, math, os, re, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from study_assistant.text import WORD_RE
+from study_assistant.tfidf import BACKGROUND_DF_PATH
+
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+WORDFREQ_ATTRIBUTION = "Derived from wordfreq data by Robyn Speer (https://github.com/rspeer/wordfreq)"
+WORDFREQ_LICENSE = "CC BY-SA 4.0 (https://creativecommons.org/licenses/by-sa/4.0/)"
+
+def ranked_estimates(path, documents, r0=25.0, exponent=0.75):
+    # df(rank) = documents * min(1, (r0 / rank) ** exponent): the top ~r0 words occur in every document
+    words = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.lstrip().startswith("#"):
+                words.extend(w.lower() for w in line.split())
+    df = {}
+    for rank, w in enumerate(dict.fromkeys(words), 1):
+        if WORD_RE.fullmatch(w):
+            df[w] = max(1, round(documents * min(1.0, (r0 / rank) ** exponent)))
+    return df
+
+def wordfreq_estimates(lang, documents, terms, doc_tokens):
+    from wordfreq import top_n_list, word_frequency   # build-time only; the app just reads the table
+    df = {}
+    for w in top_n_list(lang, terms * 2):
+        if len(df) >= terms:
+            break
+        if WORD_RE.fullmatch(w) and w.islower():
+            n = round(documents * -math.expm1(-word_frequency(w, lang) * doc_tokens))
+            if n >= 1:
+                df[w] = n
+    return df
+
+def corpus_counts(roots):
+    df, n_docs = {}, 0
+    for root in roots:
+        for dirpath, _, names in os.walk(root):
+            for name in sorted(names):
+                if not name.lower().endswith(".txt"):
+                    continue
+                with open(os.path.join(dirpath, name), encoding="utf-8", errors="ignore") as f:
+                    text = f.read()
+                for para in PARAGRAPH_RE.split(text):
+                    terms = {w.lower() for w in WORD_RE.findall(para)}
+                    if not terms:
+                        continue
+                    n_docs += 1
+                    for t in terms:
+                        df[t] = df.get(t, 0) + 1
+    return df, n_docs
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build the TF-IDF background document-frequency table.")
+    ap.add_argument("--ranked", help="frequency-ranked word list (most frequent first)")
+    ap.add_argument("--wordfreq", metavar="LANG", help="derive document frequencies from the wordfreq package")
+    ap.add_argument("--terms", type=int, default=60000, help="most frequent --wordfreq words kept (default 60000)")
+    ap.add_argument("--doc-tokens", type=int, default=250, help="document length L for --wordfreq (default 250)")
+    ap.add_argument("--corpus", action="append", default=[], help="directory of .txt files (repeatable)")
+    ap.add_argument("--documents", type=int, default=100000, help="background collection size N (default 100000)")
+    ap.add_argument("--min-df", type=int, default=2, help="drop corpus terms seen in fewer documents")
+    ap.add_argument("-o", "--output", default=BACKGROUND_DF_PATH)
+    args = ap.parse_args(argv)
+    if not (args.ranked or args.wordfreq or args.corpus):
+        ap.error("give --wordfreq, --ranked and/or --corpus")
+
+    df, sources, notice = {}, [], {}
+    if args.ranked:
+        df.update(ranked_estimates(args.ranked, args.documents))
+        sources.append(f"zipf:{os.path.basename(args.ranked)}")
+    if args.wordfreq:
+        df.update(wordfreq_estimates(args.wordfreq, args.documents, args.terms, args.doc_tokens))
+        sources.append(f"wordfreq:{args.wordfreq} L={args.doc_tokens}")
+        notice = {"attribution": WORDFREQ_ATTRIBUTION, "license": WORDFREQ_LICENSE}
+    if args.corpus:
+        counts, n_docs = corpus_counts(args.corpus)
+        scale = args.documents / n_docs if n_docs else 0
+        df.update({t: max(1, round(c * scale)) for t, c in counts.items() if c >= args.min_df})
+        sources.append(f"corpus:{n_docs} paragraphs")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"documents": args.documents, "source": " + ".join(sources), **notice,
+                   "df": dict(sorted(df.items(), key=lambda kv: (-kv[1], kv[0])))}, f, separators=(",", ":"))
+    print(f"Wrote {len(df)} terms to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+# Build the prebuilt lexicon (stop-word tables + shipped domain vocabularies) that is loaded at startup.
+# Run it after editing study_assistant/resources/*_words.txt or study_assistant/domains/*.txt.
+#
+#   python tools/build_lexicon.py
+
+import argparse, json, os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from study_assistant.lexicon import LEXICON_PATH, build_lexicon
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build the stop-word and domain-vocabulary lexicon.")
+    ap.add_argument("-o", "--output", default=LEXICON_PATH)
+    args = ap.parse_args(argv)
+    lexicon = build_lexicon()
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(lexicon, f, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    terms = sum(len(t) for t in lexicon["domains"].values())
+    print(f"Wrote {len(lexicon['stopwords'])} stop words, {len(lexicon['generic_words'])} generic words and "
+          f"{terms} terms in {len(lexicon['domains'])} domains to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())